@@ -0,0 +1,235 @@
+"""Saved searches matched against newly scraped jobs.
+
+Saved searches are kept in ``saved_searches.json``. After each scrape,
+``run_saved_searches`` finds the jobs not seen on previous runs and
+percolates them through an index of the saved searches: every job looks up
+only the searches that could match it (by keyword fragment or facet value)
+and verifies those, so cost grows with new jobs x candidate searches rather
+than the whole dataset x all searches. Matches are appended to
+``alerts_outbox.jsonl`` (or POSTed to a search's webhook, if it has one).
+"""
+import json
+import os
+import re
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils import add_categories
+
+SAVED_SEARCHES_FILE = "saved_searches.json"
+SEEN_JOBS_FILE = "alerts_seen.npy"
+OUTBOX_FILE = "alerts_outbox.jsonl"
+
+SEARCH_FIELDS = ["keyword", "location", "category", "source"]
+TEXT_COLUMNS = ["title", "company", "description", "location"]
+
+# Keyword anchors are indexed by their first few characters
+ANCHOR_LENGTH = 3
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+def load_saved_searches(filename=SAVED_SEARCHES_FILE):
+    try:
+        with open(filename, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def _write_saved_searches(searches, filename):
+    tmp = f"{filename}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(searches, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, filename)
+
+
+def _search_filters(keyword=None, location=None, category=None, source=None):
+    """The non-empty filters of a search; empty/"All ..." values are dropped."""
+    filters = {}
+    for field, value in zip(SEARCH_FIELDS, [keyword, location, category, source]):
+        if value and not str(value).startswith("All ") and str(value).strip():
+            filters[field] = str(value).strip()
+    return filters
+
+
+def find_saved_search(keyword=None, location=None, category=None, source=None,
+                      filename=SAVED_SEARCHES_FILE):
+    """The saved search with exactly these filters, or None."""
+    filters = _search_filters(keyword, location, category, source)
+    for search in load_saved_searches(filename):
+        if {f: search[f] for f in SEARCH_FIELDS if f in search} == filters:
+            return search
+    return None
+
+
+def add_saved_search(keyword=None, location=None, category=None, source=None,
+                     name=None, webhook=None, filename=SAVED_SEARCHES_FILE):
+    """Store a saved search and return it.
+    
+    Empty/"All ..." filters are dropped. If a search with the same filters
+    already exists, that one is returned and nothing is added.
+    """
+    existing = find_saved_search(keyword, location, category, source, filename)
+    if existing is not None:
+        return existing
+
+    search = {"id": uuid.uuid4().hex[:12], "name": name or keyword or "Saved search"}
+    search.update(_search_filters(keyword, location, category, source))
+    if webhook:
+        search["webhook"] = webhook
+    search["created"] = datetime.now().isoformat(timespec="seconds")
+
+    searches = load_saved_searches(filename)
+    searches.append(search)
+    _write_saved_searches(searches, filename)
+    return search
+
+
+def remove_saved_search(search_id, filename=SAVED_SEARCHES_FILE):
+    searches = load_saved_searches(filename)
+    kept = [s for s in searches if s["id"] != search_id]
+    _write_saved_searches(kept, filename)
+    return len(kept) != len(searches)
+
+
+def _job_value(job, field):
+    value = job.get(field)
+    return None if value is None or (not isinstance(value, str) and pd.isna(value)) else str(value)
+
+
+class SearchIndex:
+    """Inverted index from job features to the saved searches they may match.
+
+    Keywords match the way the app's search box does (utils.search_jobs):
+    the whole keyword, case-insensitively, as plain text inside the job's
+    title, company, description or location. A search with a keyword is
+    filed under the first few characters of its longest token, which must
+    then occur inside some word of a matching job; otherwise it is filed
+    under its most selective facet (city, then category, then source).
+    """
+
+    def __init__(self, searches):
+        self.searches = {s["id"]: s for s in searches}
+        self.by_fragment = defaultdict(list)
+        self.by_facet = defaultdict(list)
+        self.match_all = []
+
+        for search in searches:
+            tokens = tokenize(search.get("keyword", ""))
+            if tokens:
+                anchor = max(tokens, key=len)
+                self.by_fragment[anchor[:ANCHOR_LENGTH]].append(search["id"])
+            elif search.get("location"):
+                self.by_facet[("city", search["location"])].append(search["id"])
+            elif search.get("category"):
+                self.by_facet[("category", search["category"])].append(search["id"])
+            elif search.get("source"):
+                self.by_facet[("source", search["source"])].append(search["id"])
+            else:
+                self.match_all.append(search["id"])
+
+    def candidates(self, job, texts):
+        found = set(self.match_all)
+        words = {w for text in texts for w in tokenize(text)}
+        fragments = {w[i:i + n] for w in words for n in range(1, ANCHOR_LENGTH + 1)
+                     for i in range(len(w) - n + 1)}
+        for fragment in fragments:
+            found.update(self.by_fragment.get(fragment, ()))
+        for facet in ("city", "category", "source"):
+            found.update(self.by_facet.get((facet, _job_value(job, facet)), ()))
+        return found
+
+    def verify(self, search_id, job, texts):
+        search = self.searches[search_id]
+        if search.get("location") and _job_value(job, "city") != search["location"]:
+            return False
+        if search.get("category") and _job_value(job, "category") != search["category"]:
+            return False
+        if search.get("source") and _job_value(job, "source") != search["source"]:
+            return False
+        keyword = search.get("keyword", "").lower()
+        return not keyword or any(keyword in text for text in texts)
+
+    def percolate(self, job):
+        """Ids of the saved searches matching one job record."""
+        texts = [(_job_value(job, column) or "").lower() for column in TEXT_COLUMNS]
+        return [sid for sid in self.candidates(job, texts) if self.verify(sid, job, texts)]
+
+
+def job_keys(df):
+    """Stable 64-bit key per job, from its link and title."""
+    return pd.util.hash_pandas_object(
+        df[["link", "title"]].astype(str), index=False
+    ).to_numpy(dtype=np.uint64)
+
+
+def new_jobs(df, seen_file=SEEN_JOBS_FILE):
+    """Split ``df`` into jobs not seen on earlier runs, plus all keys to remember.
+
+    The first run only records a baseline, so existing jobs are not alerted.
+    """
+    keys = job_keys(df)
+    if os.path.exists(seen_file):
+        seen = np.load(seen_file)
+        fresh = ~np.isin(keys, seen)
+        all_keys = np.union1d(seen, keys)
+    else:
+        fresh = np.zeros(len(df), dtype=bool)
+        all_keys = np.unique(keys)
+    return df[fresh], all_keys
+
+
+def _deliver(search, matches, outbox):
+    payload = {
+        "search_id": search["id"],
+        "search": {f: search[f] for f in ["name"] + SEARCH_FIELDS if f in search},
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "jobs": matches,
+    }
+    if search.get("webhook"):
+        try:
+            import requests
+            requests.post(search["webhook"], json=payload, timeout=10).raise_for_status()
+            return
+        except Exception as e:
+            print(f"[ALERTS] Webhook for {search['id']} failed, writing to outbox: {e}")
+    with open(outbox, "a", encoding="utf-8") as f:
+        f.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+
+
+def run_saved_searches(df, searches_file=SAVED_SEARCHES_FILE, seen_file=SEEN_JOBS_FILE,
+                       outbox=OUTBOX_FILE):
+    """Match jobs new since the last run against all saved searches.
+
+    Returns ``{search_id: number_of_new_matches}``.
+    """
+    if df.empty:
+        return {}
+
+    fresh, all_keys = new_jobs(add_categories(df), seen_file)
+    searches = load_saved_searches(searches_file)
+    results = defaultdict(list)
+
+    if searches and not fresh.empty:
+        index = SearchIndex(searches)
+        fields = [c for c in ["title", "company", "location", "city", "category",
+                              "salary", "link", "source", "posted_date"] if c in fresh.columns]
+        for job in fresh.to_dict("records"):
+            for search_id in index.percolate(job):
+                results[search_id].append({f: job[f] for f in fields})
+
+        for search_id, matches in results.items():
+            _deliver(index.searches[search_id], matches, outbox)
+
+    np.save(seen_file, all_keys)
+    print(f"[ALERTS] {len(fresh)} new jobs, {len(searches)} saved searches, "
+          f"{sum(len(m) for m in results.values())} matches")
+    return {search_id: len(matches) for search_id, matches in results.items()}
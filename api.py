@@ -0,0 +1,237 @@
+"""Lightweight JSON search API over the published jobs dataset.
+
+Usage: python api.py [--host 0.0.0.0] [--port 8000] [--datasets datasets]
+
+Endpoints:
+    GET /jobs?q=&location=&category=&source=&limit=&cursor=
+    GET /version
+    GET /facets
+
+Responses are gzip-compressed when the client accepts it and carry a weak
+ETag of the dataset version, so unchanged results come back as 304.
+"""
+import argparse
+import base64
+import gzip
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from facets import compute_facets
+from gazetteer import canonical_city
+from publish import DATASETS_DIR, current_version, load_facets, load_version
+from utils import add_categories, filter_by_category, filter_by_location, filter_by_source, search_jobs
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+GZIP_MIN_BYTES = 1024
+RESULT_CACHE_SIZE = 256
+
+JOB_FIELDS = ["title", "company", "location", "city", "category", "salary", "salary_min",
+              "salary_max", "link", "source", "posted_date"]
+
+
+class JobDataset:
+    """The loaded jobs frame plus a small LRU of filter results.
+
+    Reloads when a new version is published; a reload builds the new frame
+    first and then swaps it in, so in-flight requests keep working. The
+    version, frame, description store and facet counts are swapped as one
+    tuple, so a reader never mixes two versions.
+    """
+
+    def __init__(self, datasets_dir=DATASETS_DIR):
+        self.datasets_dir = datasets_dir
+        self.lock = threading.Lock()
+        self.snapshot = (None, pd.DataFrame(), None, compute_facets(pd.DataFrame()))
+        self.results = OrderedDict()
+
+    def current(self):
+        """``(version, df, descriptions, facets)`` for the published version."""
+        version = current_version(self.datasets_dir) or "empty"
+        if version != self.snapshot[0]:
+            with self.lock:
+                if version != self.snapshot[0]:
+                    if version == "empty":
+                        df, descriptions = pd.DataFrame(), None
+                    else:
+                        df, descriptions = load_version(version, self.datasets_dir)
+                    df = add_categories(df)
+                    facets = (version != "empty" and load_facets(version, self.datasets_dir)) or compute_facets(df)
+                    self.snapshot = (version, df, descriptions, facets)
+                    self.results = OrderedDict()
+        return self.snapshot
+
+    def matching_rows(self, q, location, category, source):
+        """Row labels matching the filters for the current version (cached)."""
+        version, df, descriptions, _ = self.current()
+        key = (version, q, location, category, source)
+        with self.lock:
+            if key in self.results:
+                self.results.move_to_end(key)
+                return version, df, descriptions, self.results[key]
+
+        matches = search_jobs(df, q, descriptions=descriptions)
+        matches = filter_by_location(matches, location or "All Locations")
+        matches = filter_by_category(matches, category)
+        matches = filter_by_source(matches, source)
+        rows = matches.index
+
+        with self.lock:
+            self.results[key] = rows
+            if len(self.results) > RESULT_CACHE_SIZE:
+                self.results.popitem(last=False)
+        return version, df, descriptions, rows
+
+
+def encode_cursor(version, offset):
+    raw = json.dumps({"v": version, "o": offset}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    data = json.loads(base64.urlsafe_b64decode(padded))
+    return data["v"], int(data["o"])
+
+
+def _json_value(value):
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def serialize_jobs(df, rows, descriptions):
+    page = df.loc[rows, [c for c in JOB_FIELDS if c in df.columns]]
+    if "description" in df.columns:
+        page_descriptions = df.loc[rows, "description"].tolist()
+    elif descriptions is not None:
+        page_descriptions = descriptions.get(rows)
+    else:
+        page_descriptions = [None] * len(rows)
+
+    jobs = []
+    for (_, job), description in zip(page.iterrows(), page_descriptions):
+        record = {field: _json_value(value) for field, value in job.items()}
+        record["description"] = description
+        jobs.append(record)
+    return jobs
+
+
+class JobsHandler(BaseHTTPRequestHandler):
+    dataset = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            if url.path == "/jobs":
+                self.handle_jobs(params)
+            elif url.path == "/version":
+                version, df, _, _ = self.dataset.current()
+                self.send_json({"version": version, "total": len(df)}, version)
+            elif url.path == "/facets":
+                version, _, _, facets = self.dataset.current()
+                self.send_json({"version": version, **facets}, version)
+            else:
+                self.send_json({"error": "not found"}, status=404)
+        except Exception as e:
+            self.send_json({"error": str(e)}, status=500)
+
+    def handle_jobs(self, params):
+        try:
+            limit = min(max(int(params.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            return self.send_json({"error": "limit must be an integer"}, status=400)
+
+        # Checked before filtering so a revalidation costs one stat call
+        etag = f'W/"{self.dataset.current()[0]}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self.send_not_modified(etag)
+
+        location = params.get("location")
+        if location and location != "All Locations":
+            location = canonical_city(location)
+            if location is None:
+                return self.send_json({"error": f"unknown location: {params['location']}"}, status=400)
+
+        version, df, descriptions, rows = self.dataset.matching_rows(
+            params.get("q", "").strip(),
+            location,
+            params.get("category"),
+            params.get("source"),
+        )
+
+        offset = 0
+        if params.get("cursor"):
+            try:
+                cursor_version, offset = decode_cursor(params["cursor"])
+            except (ValueError, KeyError, TypeError):
+                return self.send_json({"error": "invalid cursor"}, status=400)
+            if cursor_version != version:
+                return self.send_json({"error": "cursor expired, dataset was updated"}, status=410)
+            if not 0 <= offset <= len(rows):
+                return self.send_json({"error": "invalid cursor"}, status=400)
+
+        page_rows = rows[offset:offset + limit]
+        next_offset = offset + len(page_rows)
+        self.send_json({
+            "version": version,
+            "total": len(rows),
+            "jobs": serialize_jobs(df, page_rows, descriptions),
+            "next_cursor": encode_cursor(version, next_offset) if next_offset < len(rows) else None,
+        }, version)
+
+    def send_not_modified(self, etag):
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+    def send_json(self, data, version=None, status=200):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Vary", "Accept-Encoding")
+        if version is not None and status == 200:
+            self.send_header("ETag", f'W/"{version}"')
+            self.send_header("Cache-Control", "no-cache")
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(host="127.0.0.1", port=8000, datasets_dir=DATASETS_DIR):
+    handler = type("Handler", (JobsHandler,), {"dataset": JobDataset(datasets_dir)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JobFinder JSON search API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--datasets", default=DATASETS_DIR)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.datasets)
+    print(f"[API] Serving {args.datasets} on http://{args.host}:{args.port}/jobs")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
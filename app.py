@@ -1,12 +1,20 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
-import os
-from scraper import scrape_all_sources, save_jobs_cache, load_jobs_cache
+from publish import current_manifest, current_version, load_facets, load_version, migrate_legacy_cache, publish_dataset
+from journal import ScrapeJournal, prune_runs
+from alerts import add_saved_search, find_saved_search, run_saved_searches
+from utils import SalaryIndex, add_categories, search_jobs
+from gazetteer import CITY_CATEGORIES, UNSPECIFIED_CITY
+from facets import FacetIndex, compute_facets
 
 # ADMIN PASSWORD - Change this to your own secret password
 ADMIN_PASSWORD = "admin123"  # Change this!
 
+# Upper end of the salary slider (PKR per month)
+SALARY_SLIDER_MAX = 1_000_000
+
 # GitHub RAW URL
 GITHUB_RAW_URL = "https://raw.githubusercontent.com/ZainMushtaq9/Kashif-Birthday-wishes/main/job_links.txt"
 
@@ -113,18 +121,32 @@ if "admin_authenticated" not in st.session_state:
 if "show_admin" not in st.session_state:
     st.session_state["show_admin"] = False
 
-# Load jobs from cache
+# One copy of each published version per process, shared by all sessions
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_dataset(version):
+    """Load a published dataset version with its description store, indexes and facet counts"""
+    df, descriptions = load_version(version)
+    df = add_categories(df)
+    # Versions published before facets.json existed get their counts computed once here
+    facets = load_facets(version) or compute_facets(df)
+    return df, descriptions, SalaryIndex(df), FacetIndex(df), facets
+
+# Load jobs from the current published version
 def load_initial_jobs():
-    """Load jobs from cache file"""
-    if st.session_state["jobs"].empty:
-        cached_df = load_jobs_cache()
-        if not cached_df.empty:
-            st.session_state["jobs"] = cached_df
-            if os.path.exists("jobs_cache.csv"):
-                cache_time = datetime.fromtimestamp(os.path.getmtime("jobs_cache.csv"))
-                st.session_state["last_scrape"] = cache_time.isoformat()
+    """Switch this session to the current dataset version if it changed"""
+    version = current_version() or migrate_legacy_cache()
+    if version is None or st.session_state.get("dataset_version") == version:
+        return
+    df, descriptions, salary_index, facet_index, facets = load_dataset(version)
+    st.session_state["jobs"] = df
+    st.session_state["descriptions"] = descriptions
+    st.session_state["salary_index"] = salary_index
+    st.session_state["facet_index"] = facet_index
+    st.session_state["facets"] = facets
+    st.session_state["dataset_version"] = version
+    st.session_state["last_scrape"] = current_manifest()["published_at"]
 
-# Load jobs on startup
+# Checked on every rerun: a stat call on the version pointer unless it changed
 load_initial_jobs()
 
 # Sidebar
@@ -160,24 +182,45 @@ with st.sidebar:
             st.success("✅ Logged in as Admin")
             
             # Show cache status
-            if os.path.exists("jobs_cache.csv"):
-                cache_time = datetime.fromtimestamp(os.path.getmtime("jobs_cache.csv"))
+            if st.session_state["last_scrape"]:
+                cache_time = datetime.fromisoformat(st.session_state["last_scrape"])
                 hours_old = int((datetime.now() - cache_time).total_seconds() / 3600)
-                st.info(f"📊 Cache is {hours_old} hours old")
+                st.info(f"📊 Dataset {st.session_state['dataset_version']} is {hours_old} hours old")
+            
+            # A run in progress (here or in the scheduler) holds its lock; an
+            # unfinished run without one was interrupted and can be continued
+            latest_run = ScrapeJournal.latest()
+            running = latest_run is not None and latest_run.is_active()
+            resume = False
+            if running:
+                manifest = latest_run.manifest
+                st.info(f"🔄 Run {manifest['run_id']} is scraping now: "
+                        f"{manifest['sites_done']}/{len(manifest['sources'])} sites done")
+            elif ScrapeJournal.latest_incomplete() is not None:
+                manifest = latest_run.manifest
+                st.info(f"⏸️ Interrupted run {manifest['run_id']}: "
+                        f"{manifest['sites_done']}/{len(manifest['sources'])} sites done")
+                resume = st.button("⏯️ Resume Interrupted Run", use_container_width=True)
             
             # Update Jobs Button
-            if st.button("🔄 Update Jobs Now", use_container_width=True, type="primary"):
+            update = st.button("🔄 Update Jobs Now", use_container_width=True, type="primary",
+                               disabled=running)
+            if update or resume:
                 with st.spinner("🔍 Scraping 200+ websites... This will take 10-15 minutes. You can close this and come back later."):
                     try:
-                        df = scrape_all_sources(GITHUB_RAW_URL)
-                        if not df.empty:
-                            save_jobs_cache(df)
-                            st.session_state["jobs"] = df
-                            st.session_state["last_scrape"] = datetime.now().isoformat()
+                        # Selenium and friends are only imported when an admin scrapes
+                        from scraper import scrape_all_sources
+                        df = scrape_all_sources(GITHUB_RAW_URL, resume=resume)
+                        if df.empty:
+                            st.error("❌ No jobs found. Please try again.")
+                        elif publish_dataset(df) is None:
+                            st.error("❌ Saving the new jobs failed; the previous jobs are still shown.")
+                        else:
+                            prune_runs()
+                            run_saved_searches(df)
+                            load_initial_jobs()
                             st.success(f"✅ Successfully updated {len(df)} jobs!")
                             st.balloons()
-                        else:
-                            st.error("❌ No jobs found. Please try again.")
                     except Exception as e:
                         st.error(f"❌ Error: {str(e)}")
             
@@ -196,9 +239,7 @@ with st.sidebar:
     st.markdown("### 📋 Filters")
     
     # Location filter
-    locations = ["All Locations", "Karachi", "Lahore", "Islamabad", "Rawalpindi", 
-                 "Faisalabad", "Multan", "Peshawar", "Quetta", "Bahawalpur", 
-                 "Hyderabad", "Gujranwala", "Sialkot", "Remote"]
+    locations = ["All Locations"] + [c for c in CITY_CATEGORIES if c != UNSPECIFIED_CITY]
     location_filter = st.selectbox("📍 Location", locations)
     
     # Category filter
@@ -206,14 +247,31 @@ with st.sidebar:
                   "Finance & Accounting", "Education", "Healthcare", "Engineering", "Other"]
     category_filter = st.selectbox("📂 Category", categories)
     
+    # Salary filter (monthly PKR, parsed at ingest)
+    salary_range = st.slider(
+        "💰 Salary (PKR/month)",
+        0, SALARY_SLIDER_MAX, (0, SALARY_SLIDER_MAX),
+        step=10_000
+    )
+    
+    sort_order = st.selectbox("↕️ Sort by", ["Newest", "Salary: High to Low", "Salary: Low to High"])
+    
     # Job source filter
     df = st.session_state["jobs"]
     if not df.empty:
-        sources = ["All Sources"] + sorted(df["source"].unique().tolist())
+        sources = ["All Sources"] + st.session_state["facets"]["sources"]
         source_filter = st.selectbox("🌐 Source", sources)
     else:
         source_filter = "All Sources"
     
+    # Saved search, matched against new jobs after every update
+    if st.button("🔔 Alert Me About New Matches", use_container_width=True):
+        if find_saved_search(search_query, location_filter, category_filter, source_filter):
+            st.info("🔔 You already have an alert for this search.")
+        else:
+            add_saved_search(search_query, location_filter, category_filter, source_filter)
+            st.success("✅ Search saved! New matching jobs are sent after each update.")
+    
     st.markdown("---")
     
     # Info
@@ -223,10 +281,16 @@ with st.sidebar:
     if not df.empty:
         st.markdown("---")
         st.markdown("### 📥 Download")
-        csv_data = df.to_csv(index=False)
+        
+        def export_csv(df=df, store=st.session_state.get("descriptions")):
+            # Built only when clicked; pulls descriptions back in from disk
+            if store is not None and "description" not in df.columns:
+                df = df.assign(description=store.get(df.index))
+            return df.to_csv(index=False)
+        
         st.download_button(
             "📄 Download All Jobs",
-            csv_data,
+            export_csv,
             "jobfinder_jobs.csv",
             "text/csv",
             use_container_width=True
@@ -253,49 +317,29 @@ if df.empty:
     """)
     st.stop()
 
-# Add category column
-if "category" not in df.columns:
-    def categorize_job(title):
-        title = str(title).lower()
-        if any(word in title for word in ["engineer", "developer", "programmer", "software", "it"]):
-            return "IT & Software"
-        elif any(word in title for word in ["manager", "executive", "director", "head", "ceo"]):
-            return "Management"
-        elif any(word in title for word in ["marketing", "sales", "business"]):
-            return "Sales & Marketing"
-        elif any(word in title for word in ["accountant", "finance", "audit", "banking"]):
-            return "Finance & Accounting"
-        elif any(word in title for word in ["teacher", "professor", "education", "lecturer"]):
-            return "Education"
-        elif any(word in title for word in ["doctor", "nurse", "medical", "health"]):
-            return "Healthcare"
-        elif any(word in title for word in ["civil", "mechanical", "electrical"]):
-            return "Engineering"
-        else:
-            return "Other"
-    
-    df["category"] = df["title"].apply(categorize_job)
-
-# Apply filters
-filtered_df = df.copy()
+# Apply filters (each step returns a new view; the cached frame is never copied whole)
+filtered_df = df
+descriptions = st.session_state.get("descriptions")
 
-if search_query:
-    filtered_df = filtered_df[
-        filtered_df["title"].str.contains(search_query, case=False, na=False) |
-        filtered_df["company"].str.contains(search_query, case=False, na=False) |
-        filtered_df["description"].str.contains(search_query, case=False, na=False)
-    ]
+salary_index = st.session_state["salary_index"]
+facet_index = st.session_state["facet_index"]
+facets = st.session_state["facets"]
 
-if location_filter != "All Locations":
-    filtered_df = filtered_df[
-        filtered_df["location"].str.contains(location_filter, case=False, na=False)
-    ]
+# Salary and facet filters are row positions of the unfiltered frame, intersected
+# before any rows are touched
+positions = facet_index.select(city=location_filter, category=category_filter, source=source_filter)
+min_salary, max_salary = salary_range
+if min_salary > 0 or max_salary < SALARY_SLIDER_MAX:
+    salary_rows = salary_index.range(
+        min_salary or None,
+        max_salary if max_salary < SALARY_SLIDER_MAX else None
+    )
+    positions = salary_rows if positions is None else np.intersect1d(positions, salary_rows, assume_unique=True)
+if positions is not None:
+    filtered_df = df.iloc[positions]
 
-if category_filter != "All Categories":
-    filtered_df = filtered_df[filtered_df["category"] == category_filter]
-
-if source_filter != "All Sources":
-    filtered_df = filtered_df[filtered_df["source"] == source_filter]
+# Same plain-text matching as the API
+filtered_df = search_jobs(filtered_df, search_query, descriptions=descriptions)
 
 # Statistics
 col1, col2, col3, col4 = st.columns(4)
@@ -308,8 +352,17 @@ with col1:
     </div>
     """, unsafe_allow_html=True)
 
+# Unfiltered views show the counts stored with the dataset; filtered ones count
+# distinct codes over the matching rows only
+if len(filtered_df) == len(df):
+    unique_companies = facets["total_companies"]
+    unique_locations = facets["total_locations"]
+else:
+    rows = df.index.get_indexer(filtered_df.index)
+    unique_companies = facet_index.count_distinct("company", rows)
+    unique_locations = facet_index.count_distinct("city", rows)
+
 with col2:
-    unique_companies = filtered_df["company"].nunique()
     st.markdown(f"""
     <div class="stats-box">
         <h2 style="color: #764ba2; margin:0;">{unique_companies:,}</h2>
@@ -318,7 +371,6 @@ with col2:
     """, unsafe_allow_html=True)
 
 with col3:
-    unique_locations = filtered_df["location"].nunique()
     st.markdown(f"""
     <div class="stats-box">
         <h2 style="color: #f093fb; margin:0;">{unique_locations}</h2>
@@ -350,11 +402,17 @@ if filtered_df.empty:
     - Select "All Locations"
     """)
 else:
-    try:
-        filtered_df["posted_date"] = pd.to_datetime(filtered_df["posted_date"])
-        filtered_df = filtered_df.sort_values("posted_date", ascending=False)
-    except:
-        pass
+    if sort_order == "Newest":
+        try:
+            filtered_df = filtered_df.sort_values("posted_date", ascending=False)
+        except:
+            pass
+    else:
+        # Walk the presorted salary index instead of re-sorting the filtered frame
+        ranked = df.index[salary_index.sorted_rows(descending=sort_order == "Salary: High to Low")]
+        ranked = ranked[ranked.isin(filtered_df.index)]
+        rest = filtered_df.index.difference(ranked, sort=False)
+        filtered_df = filtered_df.loc[ranked.append(rest)]
     
     st.subheader(f"📋 {len(filtered_df):,} Jobs Found")
     
@@ -382,14 +440,24 @@ else:
     end_idx = start_idx + jobs_per_page
     page_df = filtered_df.iloc[start_idx:end_idx]
     
+    # Only the descriptions for the page on screen are read from disk
+    if descriptions is not None and "description" not in page_df.columns:
+        page_df = page_df.assign(description=descriptions.get(page_df.index))
+    
     for idx, job in page_df.iterrows():
         salary_display = job.get('salary', 'Not specified')
-        if salary_display == 'Not specified':
+        if pd.notna(job.get('salary_min')):
+            if job['salary_min'] == job['salary_max']:
+                salary_display = f"💰 PKR {job['salary_min']:,.0f} / month"
+            else:
+                salary_display = f"💰 PKR {job['salary_min']:,.0f} – {job['salary_max']:,.0f} / month"
+        elif pd.isna(salary_display) or salary_display == 'Not specified':
             salary_display = "💰 Salary: Negotiable"
         else:
             salary_display = f"💰 {salary_display}"
         
         category = job.get('category', 'Other')
+        posted = job['posted_date'].strftime('%Y-%m-%d') if pd.notna(job['posted_date']) else "N/A"
         
         st.markdown(f"""
         <div class="job-card">
@@ -400,7 +468,7 @@ else:
             <div class="job-detail">{salary_display}</div>
             <div class="job-detail" style="margin-top: 0.8rem;">📝 {str(job['description'])[:250]}...</div>
             <div class="job-detail" style="margin-top: 0.5rem; color: #95a5a6;">
-                🌐 {job['source']} | 📅 {job['posted_date']}
+                🌐 {job['source']} | 📅 {posted}
             </div>
             <a href="{job['link']}" target="_blank">
                 <button class="apply-btn">Apply Now →</button>
@@ -0,0 +1,56 @@
+"""Compare the full and lean Chrome profiles on real job boards.
+
+Usage: python benchmarks/bench_browser.py [N_SITES] [job_links.txt]
+
+For each profile, loads the first N sites from the links file and reports
+the median and p90 page load time and the peak RSS of the chromedriver
+process tree (sampled after every page).
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper import FULL_SETTLE_SECONDS, LEAN_SETTLE_SECONDS, driver_rss_mb, init_driver
+
+
+def run_profile(urls, lean):
+    driver = init_driver(lean=lean)
+    driver.set_page_load_timeout(30)
+    timings, peak_rss, failures = [], 0.0, 0
+    try:
+        for url in urls:
+            start = time.perf_counter()
+            try:
+                driver.get(url)
+                timings.append(time.perf_counter() - start)
+            except Exception:
+                failures += 1
+            peak_rss = max(peak_rss, driver_rss_mb(driver))
+    finally:
+        driver.quit()
+    return timings, peak_rss, failures
+
+
+def summarize(name, timings, peak_rss, failures, settle):
+    if not timings:
+        print(f"{name:<6} no successful page loads ({failures} failures)")
+        return
+    ordered = sorted(timings)
+    p90 = ordered[int(0.9 * (len(ordered) - 1))]
+    print(f"{name:<6} pages={len(timings):<4} failures={failures:<3} "
+          f"load median={statistics.median(timings):.2f}s p90={p90:.2f}s "
+          f"+settle={settle}s  peak RSS={peak_rss:.0f} MB")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    links_file = sys.argv[2] if len(sys.argv) > 2 else "job_links.txt"
+    with open(links_file) as f:
+        urls = [line.strip() for line in f if line.strip().startswith("http")][:count]
+
+    print(f"[BENCH] {len(urls)} sites from {links_file}")
+    summarize("full", *run_profile(urls, lean=False), FULL_SETTLE_SECONDS)
+    summarize("lean", *run_profile(urls, lean=True), LEAN_SETTLE_SECONDS)
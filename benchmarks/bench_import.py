@@ -0,0 +1,90 @@
+"""Import time and memory of the browse-only path versus the scraping path.
+
+Usage: python benchmarks/bench_import.py [--check]
+
+Each measurement runs in a fresh interpreter. The browse path is what the
+app, API and alerts import for visitors who only read the published
+dataset; the scrape path adds scraper.py. With --check the script exits
+non-zero if any scraping-only module (selenium, bs4, requests, fpdf) is
+imported by the browse path or by a run of app.py, or if app.py fails to
+run, which makes it usable as a CI regression gate. test_browse_imports.py
+runs the same check under pytest.
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BROWSE_MODULES = ["storage", "publish", "facets", "utils", "gazetteer", "schema", "journal", "alerts", "api"]
+SCRAPE_MODULES = BROWSE_MODULES + ["scraper"]
+HEAVY_MODULES = ["selenium", "bs4", "requests", "fpdf"]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+heavy = sorted({{m.split(".")[0] for m in sys.modules}} & set({heavy!r}))
+print(json.dumps({{"seconds": elapsed, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "heavy": heavy}}))
+"""
+
+APP_PROBE = """
+import json, sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120).run()
+heavy = sorted({{m.split(".")[0] for m in sys.modules}} & set({heavy!r}))
+print(json.dumps({{"heavy": heavy, "errors": [e.value for e in at.exception]}}))
+"""
+
+
+def run_probe(code, cwd=ROOT):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(modules, repeat=3):
+    runs = [run_probe(PROBE.format(modules=modules, heavy=HEAVY_MODULES)) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["seconds"])
+    return best["seconds"], best["max_rss_kb"] / 1024, best["heavy"]
+
+
+def main():
+    check = "--check" in sys.argv[1:]
+    failures = []
+
+    browse = measure(BROWSE_MODULES)
+    print(f"[BENCH] browse path: {browse[0] * 1000:.0f} ms, peak RSS {browse[1]:.0f} MB, "
+          f"heavy modules: {browse[2] or 'none'}")
+    if browse[2]:
+        failures.append(f"browse path imported {', '.join(browse[2])}")
+
+    if not check:
+        try:
+            scrape = measure(SCRAPE_MODULES)
+            print(f"[BENCH] scrape path: {scrape[0] * 1000:.0f} ms, peak RSS {scrape[1]:.0f} MB")
+        except subprocess.CalledProcessError as e:
+            print(f"[BENCH] scrape path not importable here: {e.stderr.strip().splitlines()[-1]}")
+
+    try:
+        app = run_probe(APP_PROBE.format(app=os.path.join(ROOT, "app.py"), heavy=HEAVY_MODULES))
+        print(f"[BENCH] app.py run imported heavy modules: {app['heavy'] or 'none'}")
+        if app["heavy"]:
+            failures.append(f"app.py imported {', '.join(app['heavy'])}")
+        if app["errors"]:
+            failures.append(f"app.py raised {app['errors'][0]}")
+    except subprocess.CalledProcessError as e:
+        print(f"[BENCH] app.py check could not run: {e.stderr.strip().splitlines()[-1]}")
+        failures.append("app.py check could not run")
+
+    if check and failures:
+        print("[FAIL] " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Local load test for the JSON search API.
+
+Usage: python benchmarks/load_test.py [--url http://127.0.0.1:8000] [--threads 16] [--seconds 10]
+
+Without --url an in-process server is started over --datasets. Each worker
+issues a mix of keyword, facet and paginated queries (half of them as
+ETag revalidations) and the script reports requests per second and
+p50/p99 latency.
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+QUERIES = [
+    "/jobs",
+    "/jobs?q=engineer",
+    "/jobs?q=accountant&location=Karachi",
+    "/jobs?location=Lahore",
+    "/jobs?category=IT+%26+Software",
+    "/jobs?q=manager&limit=50",
+    "/jobs?location=Islamabad&category=Management",
+]
+
+
+def fetch(base, path, etag=None):
+    request = urllib.request.Request(base + path, headers={"Accept-Encoding": "gzip"})
+    if etag:
+        request.add_header("If-None-Match", etag)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            body = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return response.status, response.headers.get("ETag"), json.loads(body)
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers.get("ETag"), None
+
+
+def timed_fetch(base, path, latencies, statuses, etag=None):
+    """One request, recorded as one latency sample and one status."""
+    start = time.perf_counter()
+    status, new_etag, data = fetch(base, path, etag)
+    latencies.append(time.perf_counter() - start)
+    statuses.append(status)
+    return new_etag, data
+
+
+def worker(base, deadline, latencies, statuses, seed):
+    rng = random.Random(seed)
+    etags = {}
+    while time.perf_counter() < deadline:
+        path = rng.choice(QUERIES)
+        revalidate = rng.random() < 0.5
+        etag, data = timed_fetch(base, path, latencies, statuses, etags.get(path) if revalidate else None)
+        if etag:
+            etags[path] = etag
+        # Follow one page of pagination now and then
+        if data and data.get("next_cursor") and rng.random() < 0.3:
+            sep = "&" if "?" in path else "?"
+            timed_fetch(base, f"{path}{sep}cursor={data['next_cursor']}", latencies, statuses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url")
+    parser.add_argument("--datasets", default="datasets")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    server = None
+    base = args.url
+    if not base:
+        from api import make_server
+        server = make_server("127.0.0.1", 0, args.datasets)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        fetch(base, "/version")  # load the dataset before timing
+
+    latencies, statuses = [], []
+    deadline = time.perf_counter() + args.seconds
+    threads = [threading.Thread(target=worker, args=(base, deadline, latencies, statuses, i))
+               for i in range(args.threads)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    if server:
+        server.shutdown()
+    if not latencies:
+        print("[LOAD] no requests completed")
+        return
+
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+    not_modified = statuses.count(304)
+    print(f"[LOAD] {len(latencies)} requests in {elapsed:.1f}s with {args.threads} threads")
+    print(f"[LOAD] {len(latencies) / elapsed:.0f} req/s  p50={statistics.median(ordered) * 1000:.1f}ms  "
+          f"p99={p99 * 1000:.1f}ms  304s={not_modified}  errors={sum(s >= 400 for s in statuses)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Facet counts materialized at publish time, and posting lists for filtering.
+
+``compute_facets`` runs once per published version and its result is
+stored next to the data as ``facets.json``; unfiltered views read their
+numbers from there. ``FacetIndex`` keeps, for each facet column, the row
+positions of every value sorted by value code, so facet filters are slices
+and intersections of those lists and filtered counts only look at the
+matching rows.
+"""
+import json
+import os
+
+import numpy as np
+
+from utils import add_categories, get_job_statistics
+
+FACETS_FILE = "facets.json"
+FACET_COLUMNS = ["source", "category", "city", "company"]
+
+
+def compute_facets(df):
+    """All counts the UI and API show for an unfiltered dataset."""
+    df = add_categories(df)
+    facets = get_job_statistics(df)
+    if df.empty:
+        facets.update(jobs_by_source={}, jobs_by_category={}, jobs_by_city={}, sources=[])
+        return facets
+
+    facets["jobs_by_category"] = df["category"].value_counts().loc[lambda c: c > 0].to_dict()
+    facets["jobs_by_city"] = (
+        df["city"].value_counts().loc[lambda c: c > 0].to_dict() if "city" in df.columns else {}
+    )
+    facets["sources"] = sorted(str(s) for s in df["source"].dropna().unique())
+    # JSON keys must be strings and values plain ints
+    return json.loads(json.dumps(facets, default=int))
+
+
+def write_facets(facets, directory):
+    with open(os.path.join(directory, FACETS_FILE), "w", encoding="utf-8") as f:
+        json.dump(facets, f, indent=2, ensure_ascii=False)
+
+
+def read_facets(directory):
+    try:
+        with open(os.path.join(directory, FACETS_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class FacetIndex:
+    """Posting lists of row positions per facet value."""
+
+    def __init__(self, df):
+        self.size = len(df)
+        self.codes = {}
+        self.categories = {}
+        self.order = {}
+        self.bounds = {}
+        for column in FACET_COLUMNS:
+            if column not in df.columns:
+                continue
+            values = df[column].astype("category")
+            codes = values.cat.codes.to_numpy()
+            order = np.argsort(codes, kind="stable")
+            self.codes[column] = codes
+            self.categories[column] = {str(c): i for i, c in enumerate(values.cat.categories)}
+            self.order[column] = order
+            # Postings for code i are order[bounds[i]:bounds[i + 1]]
+            self.bounds[column] = np.searchsorted(
+                codes[order], np.arange(len(values.cat.categories) + 1), side="left"
+            )
+
+    def rows(self, column, value):
+        """Sorted row positions where ``column == value``."""
+        code = self.categories.get(column, {}).get(str(value))
+        if code is None:
+            return np.array([], dtype=np.int64)
+        start, end = self.bounds[column][code], self.bounds[column][code + 1]
+        return np.sort(self.order[column][start:end])
+
+    def select(self, **filters):
+        """Row positions matching every given facet value, or None if no filter applies.
+
+        Values that are empty or start with "All " are ignored, matching the
+        app's dropdown defaults.
+        """
+        result = None
+        for column, value in filters.items():
+            if not value or str(value).startswith("All "):
+                continue
+            rows = self.rows(column, value)
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        return result
+
+    def count_distinct(self, column, rows):
+        """Number of distinct values of ``column`` among ``rows``."""
+        codes = self.codes[column][rows]
+        return int(np.unique(codes[codes >= 0]).size)
+
+    def counts(self, column, rows):
+        """``{value: count}`` for ``column`` among ``rows``, largest first."""
+        codes = self.codes[column][rows]
+        totals = np.bincount(codes[codes >= 0], minlength=len(self.categories[column]))
+        names = list(self.categories[column])
+        ranked = np.argsort(-totals, kind="stable")
+        return {names[i]: int(totals[i]) for i in ranked if totals[i] > 0}
@@ -0,0 +1,381 @@
+import json
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from urllib.parse import urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from frontier import fetch_slot
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+FEED_TYPES = (
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/feed+json",
+)
+
+# Job-specific feed locations tried when the landing page does not advertise one.
+# Generic blog feeds (/feed/, /rss) are not probed: on WordPress boards they
+# list posts, not vacancies.
+FEED_PATHS = ["/jobs/feed/", "/jobs.rss", "/feed/job_listing/", "/feed/?post_type=job_listing"]
+
+MAX_FEED_ITEMS = 500
+# Detail pages fetched from sitemaps per site, and how many are tried before
+# giving up on a site whose pages carry no JSON-LD
+MAX_SITEMAP_PAGES = 30
+SITEMAP_SAMPLE = 3
+JOB_URL_PATTERN = re.compile(r"job|vacanc|career|position|opening", re.I)
+COMMENT_FEED_PATTERN = re.compile(r"comment", re.I)
+
+# A feed item counts as a job posting if it carries one of these elements
+# (WP Job Manager and most board feeds add them) or its title, link or
+# categories read like a vacancy
+JOB_ITEM_FIELDS = {"company", "location", "salary", "job_type", "jobtype", "employmenttype"}
+JOB_ITEM_PATTERN = re.compile(
+    r"\b(?:jobs?|vacanc|hiring|recruit|career|opening|wanted|required|internship)", re.I
+)
+
+
+def _domain(url):
+    return url.split("//")[-1].split("/")[0]
+
+
+def _fetch(url, timeout=10):
+    """GET a URL within the crawl's fetch limits; the response, or None on any failure."""
+    try:
+        with fetch_slot(url):
+            response = requests.get(url, headers=HEADERS, timeout=timeout)
+        response.raise_for_status()
+        return response
+    except Exception:
+        return None
+
+
+def _strip_html(text, limit=300):
+    if not text:
+        return ""
+    text = BeautifulSoup(str(text), "html.parser").get_text(" ", strip=True)
+    return text[:limit]
+
+
+def _iso_date(value):
+    """Normalize the many date formats feeds use to YYYY-MM-DD."""
+    if not value:
+        return datetime.now().strftime("%Y-%m-%d")
+    value = str(value).strip()
+    for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d",
+                "%a, %d %b %Y %H:%M:%S %z", "%a, %d %b %Y %H:%M:%S %Z"):
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    match = re.match(r"\d{4}-\d{2}-\d{2}", value)
+    if match:
+        return match.group(0)
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def _make_job(url, title, company=None, location=None, description=None,
+              salary=None, link=None, posted_date=None):
+    """Build a job record with the same fields the DOM scrapers produce."""
+    return {
+        "title": str(title).strip()[:150],
+        "company": (company or _domain(url).replace("www.", "").split('.')[0].title())[:100],
+        "location": (location or "Pakistan")[:100],
+        "description": _strip_html(description) or "Details available on website",
+        "salary": (salary or "Not specified")[:100],
+        "link": link or url,
+        "source": _domain(url),
+        "posted_date": _iso_date(posted_date),
+        "scrape_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+# ---------------------------------------------------------------------------
+# schema.org JobPosting (JSON-LD)
+# ---------------------------------------------------------------------------
+
+def _iter_jsonld_nodes(data):
+    """Yield every dict node in a JSON-LD document, following @graph and lists."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_jsonld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        for key in ("@graph", "itemListElement", "item"):
+            if key in data:
+                yield from _iter_jsonld_nodes(data[key])
+
+
+def _is_job_posting(node):
+    node_type = node.get("@type")
+    if isinstance(node_type, list):
+        return "JobPosting" in node_type
+    return node_type == "JobPosting"
+
+
+def _jsonld_location(posting):
+    locations = posting.get("jobLocation") or []
+    if isinstance(locations, dict):
+        locations = [locations]
+    parts = []
+    for loc in locations:
+        address = loc.get("address", {}) if isinstance(loc, dict) else {}
+        if isinstance(address, str):
+            parts.append(address)
+            continue
+        city = address.get("addressLocality") or address.get("addressRegion")
+        if city:
+            parts.append(city)
+    if posting.get("jobLocationType") == "TELECOMMUTE":
+        parts.append("Remote")
+    return ", ".join(dict.fromkeys(parts)) or None
+
+
+def _jsonld_salary(posting):
+    salary = posting.get("baseSalary")
+    if not salary:
+        return None
+    if not isinstance(salary, dict):
+        return str(salary)
+    currency = salary.get("currency", "PKR")
+    value = salary.get("value", {})
+    if not isinstance(value, dict):
+        return f"{currency} {value}"
+    unit = value.get("unitText", "")
+    low, high = value.get("minValue"), value.get("maxValue")
+    amount = value.get("value")
+    if low and high:
+        text = f"{currency} {low} - {high}"
+    else:
+        text = f"{currency} {amount or low or high}"
+    return f"{text} per {unit.lower()}" if unit else text
+
+
+def _jsonld_company(posting):
+    org = posting.get("hiringOrganization")
+    if isinstance(org, dict):
+        return org.get("name")
+    return org if isinstance(org, str) else None
+
+
+def parse_jsonld_jobs(html, url):
+    """Extract schema.org JobPosting records embedded in a page."""
+    jobs = []
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except (ValueError, TypeError):
+            continue
+        for node in _iter_jsonld_nodes(data):
+            if not _is_job_posting(node) or not node.get("title"):
+                continue
+            jobs.append(_make_job(
+                url,
+                node["title"],
+                company=_jsonld_company(node),
+                location=_jsonld_location(node),
+                description=node.get("description"),
+                salary=_jsonld_salary(node),
+                link=urljoin(url, node.get("url") or node.get("@id") or url),
+                posted_date=node.get("datePosted"),
+            ))
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# RSS / Atom feeds
+# ---------------------------------------------------------------------------
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(item, *names):
+    for child in item:
+        if _local(child.tag) in names:
+            if child.text and child.text.strip():
+                return child.text.strip()
+            if child.get("href"):
+                return child.get("href")
+    return None
+
+
+def _is_job_item(item, title, link):
+    fields = {_local(child.tag) for child in item}
+    if fields & JOB_ITEM_FIELDS:
+        return True
+    categories = [child.text or child.get("term") or "" for child in item
+                  if _local(child.tag) == "category"]
+    return any(JOB_ITEM_PATTERN.search(text) for text in [title, link or ""] + categories)
+
+
+def parse_feed(content, url):
+    """Parse an RSS or Atom document into job records.
+    
+    Items that do not look like job postings (blog posts, comments) are
+    skipped, so a non-empty result means the feed really lists jobs.
+    """
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError:
+        return []
+    jobs = []
+    for item in root.iter():
+        if _local(item.tag) not in ("item", "entry"):
+            continue
+        title = _child_text(item, "title")
+        link = _child_text(item, "link", "guid", "id")
+        if not title or not _is_job_item(item, title, link):
+            continue
+        # author/creator is whoever wrote the post, not the employer
+        jobs.append(_make_job(
+            url,
+            title,
+            company=_child_text(item, "company"),
+            location=_child_text(item, "location", "city"),
+            description=_child_text(item, "description", "summary", "content"),
+            salary=_child_text(item, "salary"),
+            link=link,
+            posted_date=_child_text(item, "pubdate", "published", "updated", "date"),
+        ))
+        if len(jobs) >= MAX_FEED_ITEMS:
+            break
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# Sitemaps
+# ---------------------------------------------------------------------------
+
+def _sitemap_urls_from_robots(base):
+    response = _fetch(urljoin(base, "/robots.txt"), timeout=5)
+    if response is None:
+        return []
+    return [line.split(":", 1)[1].strip() for line in response.text.splitlines()
+            if line.lower().startswith("sitemap:")]
+
+
+def collect_sitemap_job_urls(sitemap_url, limit=MAX_SITEMAP_PAGES, _depth=0):
+    """Return job detail URLs listed in a sitemap (following one index level)."""
+    response = _fetch(sitemap_url)
+    if response is None:
+        return []
+    try:
+        root = ET.fromstring(response.content)
+    except ET.ParseError:
+        return []
+
+    urls = []
+    is_index = _local(root.tag) == "sitemapindex"
+    for loc in root.iter():
+        if _local(loc.tag) != "loc" or not loc.text:
+            continue
+        target = loc.text.strip()
+        if is_index:
+            if _depth == 0 and JOB_URL_PATTERN.search(target):
+                urls.extend(collect_sitemap_job_urls(target, limit - len(urls), _depth + 1))
+        elif JOB_URL_PATTERN.search(urlparse(target).path):
+            urls.append(target)
+        if len(urls) >= limit:
+            break
+    return urls[:limit]
+
+
+def sitemap_jobs(sitemaps, limit=MAX_SITEMAP_PAGES, sample=SITEMAP_SAMPLE):
+    """JobPosting records from the job pages listed in a site's sitemaps.
+
+    At most ``limit`` pages are fetched per site. If none of the first
+    ``sample`` pages carries JSON-LD, the site's detail pages are assumed not
+    to and the rest are skipped.
+    """
+    page_urls = []
+    for sitemap_url in sitemaps:
+        page_urls.extend(collect_sitemap_job_urls(sitemap_url, limit - len(page_urls)))
+        if len(page_urls) >= limit:
+            break
+
+    jobs = []
+    for fetched, page_url in enumerate(page_urls[:limit]):
+        if fetched == sample and not jobs:
+            break
+        response = _fetch(page_url)
+        if response is not None:
+            jobs.extend(parse_jsonld_jobs(response.text, page_url))
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# Discovery and ingest
+# ---------------------------------------------------------------------------
+
+def discover_feeds(url, html=None):
+    """Find structured job sources for a site.
+
+    Returns a dict with the landing page ``html`` (if fetched), advertised or
+    well-known ``feeds`` and any ``sitemaps`` listed in robots.txt.
+    """
+    if html is None:
+        response = _fetch(url)
+        html = response.text if response is not None else ""
+
+    feeds = []
+    if html:
+        soup = BeautifulSoup(html, "html.parser")
+        for link in soup.find_all("link", rel="alternate"):
+            if link.get("type") not in FEED_TYPES or not link.get("href"):
+                continue
+            label = f"{link['href']} {link.get('title', '')}"
+            # Sites advertise their blog and comment feeds too; keep the job ones
+            if JOB_URL_PATTERN.search(label) and not COMMENT_FEED_PATTERN.search(label):
+                feeds.append(urljoin(url, link["href"]))
+
+    if not feeds:
+        for path in FEED_PATHS:
+            candidate = urljoin(url, path)
+            response = _fetch(candidate, timeout=5)
+            if response is not None and "xml" in response.headers.get("Content-Type", ""):
+                feeds.append(candidate)
+                break
+
+    return {
+        "html": html,
+        "feeds": list(dict.fromkeys(feeds)),
+        "sitemaps": _sitemap_urls_from_robots(url),
+    }
+
+
+def scrape_structured(url):
+    """Ingest jobs for a site from JSON-LD, RSS/Atom feeds or job sitemaps.
+
+    No browser is involved. Returns an empty list when the site exposes no
+    structured data, in which case the caller falls back to DOM scraping.
+    """
+    jobs = []
+    try:
+        found = discover_feeds(url)
+
+        if found["html"]:
+            jobs.extend(parse_jsonld_jobs(found["html"], url))
+
+        for feed_url in found["feeds"]:
+            response = _fetch(feed_url)
+            if response is not None:
+                jobs.extend(parse_feed(response.content, url))
+
+        if not jobs:
+            jobs.extend(sitemap_jobs(found["sitemaps"]))
+    except Exception as e:
+        print(f"[ERROR] Structured data for {url}: {e}")
+
+    # Feeds commonly repeat postings across JSON-LD and RSS
+    unique = {}
+    for job in jobs:
+        unique.setdefault((job["title"], job["link"]), job)
+    return list(unique.values())
@@ -0,0 +1,177 @@
+import hashlib
+import heapq
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urldefrag, urljoin, urlparse
+
+# Crawl limits per source; the landing page counts towards MAX_PAGES
+MAX_DEPTH = 2
+MAX_PAGES = 25
+
+# Upper bound on simultaneous HTTP page fetches across all sources
+MAX_CONCURRENCY = 8
+FETCH_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENCY)
+
+# Politeness towards one job board: requests in flight per host, and the
+# minimum gap between two request starts to the same host
+MAX_PER_HOST = 2
+HOST_DELAY = 0.5
+
+PAGINATION_TEXT = re.compile(r"^\s*(next|more|older|›|»|>|\d{1,3})\s*$", re.I)
+PAGINATION_URL = re.compile(r"[?&](page|p|pg|start|offset)=\d+|/page/\d+", re.I)
+LISTING_URL = re.compile(r"jobs?|vacanc|career|opening|position|category|city|search", re.I)
+SKIP_URL = re.compile(
+    r"\.(pdf|jpe?g|png|gif|svg|zip|docx?|xlsx?)$|login|signup|register|/cv|resume|mailto:|javascript:",
+    re.I,
+)
+
+# Lower values are crawled first
+PRIORITY_PAGINATION = 0
+PRIORITY_LISTING = 10
+
+
+class _HostSlots:
+    def __init__(self):
+        self.in_flight = threading.BoundedSemaphore(MAX_PER_HOST)
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+
+_hosts = {}
+_hosts_lock = threading.Lock()
+
+
+@contextmanager
+def fetch_slot(url):
+    """Hold a slot for one HTTP request to ``url``.
+
+    Waits for a free per-host slot and the host's delay before taking one of
+    the global ``FETCH_SLOTS``, so a busy host never ties up global slots.
+    """
+    host = urlparse(url).netloc.lower()
+    with _hosts_lock:
+        slots = _hosts.setdefault(host, _HostSlots())
+    with slots.in_flight:
+        with slots.lock:
+            now = time.monotonic()
+            start = max(now, slots.next_start)
+            slots.next_start = start + HOST_DELAY
+        time.sleep(start - now)
+        with FETCH_SLOTS:
+            yield
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter for seen URLs.
+
+    Uses one bit array and ``k`` hash positions derived from a single
+    blake2b digest, so memory stays at roughly 1.2 bytes per expected URL
+    for a 1% false positive rate.
+    """
+
+    def __init__(self, capacity=100_000, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        """Add an item; return True if it was not (probably) present before."""
+        new = False
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        return new
+
+    def __contains__(self, item):
+        for pos in self._positions(item):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                return False
+        return True
+
+
+def normalize_url(url):
+    """Canonical form used for de-duplication (no fragment or trailing slash)."""
+    url, _ = urldefrag(url)
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/") or "/"
+    query = f"?{parsed.query}" if parsed.query else ""
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{path}{query}"
+
+
+def classify_link(url, text=""):
+    """Return a crawl priority for a link, or None if it should not be followed."""
+    if SKIP_URL.search(url):
+        return None
+    if PAGINATION_URL.search(url) or PAGINATION_TEXT.match(text or ""):
+        return PRIORITY_PAGINATION
+    if LISTING_URL.search(urlparse(url).path):
+        return PRIORITY_LISTING
+    return None
+
+
+class CrawlFrontier:
+    """Priority queue of pages to crawl for a single source.
+
+    Only follows links on the source's own host, up to ``max_depth`` hops
+    from the landing page and ``max_pages`` pages in total. Pagination links
+    are preferred over other listing links, and shallower pages over deeper.
+    """
+
+    def __init__(self, start_url, max_depth=MAX_DEPTH, max_pages=MAX_PAGES, seen=None):
+        self.host = urlparse(start_url).netloc.lower()
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.seen = seen if seen is not None else BloomFilter(capacity=max(1000, max_pages * 100))
+        self.queue = []
+        self.counter = 0
+        self.dispatched = 0
+        self.push(start_url, depth=0, priority=PRIORITY_PAGINATION)
+
+    def push(self, url, depth, priority):
+        """Queue a URL if it is in scope and has not been seen."""
+        if depth > self.max_depth:
+            return False
+        url = normalize_url(url)
+        if urlparse(url).netloc.lower() != self.host:
+            return False
+        if not self.seen.add(url):
+            return False
+        self.counter += 1
+        heapq.heappush(self.queue, (priority + depth, self.counter, depth, url))
+        return True
+
+    def add_links(self, links, depth):
+        """Queue ``(href, anchor_text)`` pairs found on a page at ``depth``."""
+        for href, text in links:
+            priority = classify_link(href, text)
+            if priority is not None:
+                self.push(href, depth + 1, priority)
+
+    def pop_batch(self, size):
+        """Take up to ``size`` ``(url, depth)`` pairs within the page budget."""
+        batch = []
+        while self.queue and len(batch) < size and self.dispatched < self.max_pages:
+            _, _, depth, url = heapq.heappop(self.queue)
+            batch.append((url, depth))
+            self.dispatched += 1
+        return batch
+
+    def __bool__(self):
+        return bool(self.queue) and self.dispatched < self.max_pages
+
+
+def absolute_links(base_url, anchors):
+    """Resolve ``(href, text)`` pairs against ``base_url``, dropping empties."""
+    return [(urljoin(base_url, href), text) for href, text in anchors if href]
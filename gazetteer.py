@@ -0,0 +1,106 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Canonical city name -> lower-case aliases found in job postings
+CITY_ALIASES = {
+    "Karachi": ["karachi", "khi"],
+    "Lahore": ["lahore", "lhr"],
+    "Islamabad": ["islamabad", "isb", "isl"],
+    "Rawalpindi": ["rawalpindi", "pindi", "rwp"],
+    "Faisalabad": ["faisalabad", "lyallpur", "fsd"],
+    "Multan": ["multan"],
+    "Peshawar": ["peshawar", "psh"],
+    "Quetta": ["quetta"],
+    "Hyderabad": ["hyderabad"],
+    "Gujranwala": ["gujranwala"],
+    "Sialkot": ["sialkot"],
+    "Bahawalpur": ["bahawalpur"],
+    "Sargodha": ["sargodha"],
+    "Sukkur": ["sukkur"],
+    "Larkana": ["larkana"],
+    "Abbottabad": ["abbottabad", "abbotabad"],
+    "Mardan": ["mardan"],
+    "Sheikhupura": ["sheikhupura"],
+    "Rahim Yar Khan": ["rahim yar khan", "rahimyar khan", "ryk"],
+    "Gujrat": ["gujrat"],
+    "Kasur": ["kasur"],
+    "Sahiwal": ["sahiwal"],
+    "Okara": ["okara"],
+    "Jhang": ["jhang"],
+    "Jhelum": ["jhelum"],
+    "Chiniot": ["chiniot"],
+    "Attock": ["attock"],
+    "Taxila": ["taxila"],
+    "Wah Cantt": ["wah cantt", "wah cantonment", "wah"],
+    "Dera Ghazi Khan": ["dera ghazi khan", "d.g. khan", "dg khan", "d g khan"],
+    "Dera Ismail Khan": ["dera ismail khan", "d.i. khan", "di khan", "d i khan"],
+    "Nawabshah": ["nawabshah", "shaheed benazirabad", "benazirabad"],
+    "Mingora": ["mingora", "swat"],
+    "Gwadar": ["gwadar"],
+    "Gilgit": ["gilgit"],
+    "Skardu": ["skardu"],
+    "Muzaffarabad": ["muzaffarabad"],
+    "Mirpur": ["mirpur"],
+    "Remote": ["remote", "work from home", "wfh", "telecommute"],
+}
+
+# Category for postings that name no recognizable city
+UNSPECIFIED_CITY = "Pakistan"
+
+ALIAS_TO_CITY = {alias: city for city, aliases in CITY_ALIASES.items() for alias in aliases}
+
+# Fixed category order so integer codes are stable across datasets
+CITY_CATEGORIES = list(CITY_ALIASES) + [UNSPECIFIED_CITY]
+CITY_DTYPE = pd.CategoricalDtype(CITY_CATEGORIES)
+
+# One alternation with the longest aliases first, so "wah cantt" wins over "wah"
+CITY_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(a) for a in sorted(ALIAS_TO_CITY, key=len, reverse=True)) + r")\b",
+    re.I,
+)
+
+
+def match_city(text):
+    """Return the canonical city named in ``text``, or None."""
+    match = CITY_PATTERN.search(text or "")
+    return ALIAS_TO_CITY[match.group(1).lower()] if match else None
+
+
+def normalize_city(*columns):
+    """Vectorized city lookup over one or more text columns.
+
+    The first column that names a city wins for each row. Returns a
+    categorical Series with ``CITY_DTYPE``; rows without a match get
+    ``UNSPECIFIED_CITY``.
+    """
+    city = pd.Series(np.nan, index=columns[0].index, dtype=object)
+    for column in columns:
+        found = column.fillna("").astype(str).str.extract(CITY_PATTERN, expand=False)
+        city = city.fillna(found.str.lower().map(ALIAS_TO_CITY))
+    return city.fillna(UNSPECIFIED_CITY).astype(CITY_DTYPE)
+
+
+def canonical_city(name):
+    """Canonical city for a city name or alias in any case ("lahore", "KHI"), or None."""
+    key = str(name or "").strip().lower()
+    for city in CITY_CATEGORIES:
+        if city.lower() == key:
+            return city
+    return ALIAS_TO_CITY.get(key)
+
+
+def city_code(city):
+    """Integer code of a canonical city in ``CITY_DTYPE`` (-1 if unknown)."""
+    try:
+        return CITY_CATEGORIES.index(city)
+    except ValueError:
+        return -1
+
+
+def city_counts(cities):
+    """Jobs per city from a ``CITY_DTYPE`` column, counted over integer codes."""
+    codes = cities.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(CITY_CATEGORIES))
+    return pd.Series(counts, index=CITY_CATEGORIES)
@@ -0,0 +1,224 @@
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs are never reported as active
+    fcntl = None
+
+RUNS_DIR = "runs"
+KEEP_RUNS = 2
+# Held (flock) by the process scraping a run; the OS drops it if that process dies
+LOCK_FILE = "run.lock"
+
+
+def _try_lock(run_dir):
+    """Open and exclusively lock a run's lock file; None if another process holds it."""
+    handle = open(os.path.join(run_dir, LOCK_FILE), "a+")
+    if fcntl is not None:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return None
+    handle.seek(0)
+    handle.truncate()
+    handle.write(str(os.getpid()))
+    handle.flush()
+    return handle
+
+
+def _write_json_atomic(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ScrapeJournal:
+    """Append-only record of one scrape run.
+
+    Each run lives in ``runs/<run_id>/`` with two files:
+
+    * ``journal.jsonl`` - one ``job`` line per scraped job, followed by a
+      ``site_done`` line once all of a site's jobs are written. Lines share a
+      batch id, and jobs whose batch has no ``site_done`` line (a crash
+      mid-site) are ignored, even after the site is scraped again.
+    * ``manifest.json`` - the run's source list, status and progress counts,
+      replaced atomically after every site.
+
+    The process scraping a run holds a lock on ``run.lock``, so an unfinished
+    run whose lock is free was interrupted and can be resumed.
+    """
+
+    def __init__(self, run_dir):
+        self.run_dir = run_dir
+        self.journal_path = os.path.join(run_dir, "journal.jsonl")
+        self.manifest_path = os.path.join(run_dir, "manifest.json")
+        with open(self.manifest_path, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._lock = None
+
+    @classmethod
+    def create(cls, sources, runs_dir=RUNS_DIR):
+        """Start a new run over ``sources``, owned (locked) by this process."""
+        # Microseconds and a random suffix keep runs started together apart
+        run_id = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{uuid.uuid4().hex[:4]}"
+        run_dir = os.path.join(runs_dir, run_id)
+        os.makedirs(run_dir, exist_ok=False)
+        # Locked before the manifest exists, so the run never looks interrupted
+        lock = _try_lock(run_dir)
+        _write_json_atomic(os.path.join(run_dir, "manifest.json"), {
+            "run_id": run_id,
+            "status": "running",
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "finished_at": None,
+            "sources": list(sources),
+            "sites_done": 0,
+            "jobs_written": 0,
+        })
+        open(os.path.join(run_dir, "journal.jsonl"), "a").close()
+        journal = cls(run_dir)
+        journal._lock = lock
+        return journal
+
+    @classmethod
+    def latest(cls, runs_dir=RUNS_DIR):
+        """The most recent run, or None."""
+        if not os.path.isdir(runs_dir):
+            return None
+        for run_id in sorted(os.listdir(runs_dir), reverse=True):
+            try:
+                return cls(os.path.join(runs_dir, run_id))
+            except (OSError, ValueError):
+                continue
+        return None
+
+    @classmethod
+    def latest_incomplete(cls, runs_dir=RUNS_DIR):
+        """The most recent run if it was interrupted; otherwise None.
+        
+        A run is interrupted when it never finished and no process is still
+        scraping it. Older unfinished runs were superseded by a later run and
+        are not offered for resuming.
+        """
+        journal = cls.latest(runs_dir)
+        if journal is None or journal.manifest.get("status") == "finished" or journal.is_active():
+            return None
+        return journal
+
+    def acquire(self):
+        """Take ownership of this run; False if another process is scraping it."""
+        if self._lock is None:
+            self._lock = _try_lock(self.run_dir)
+        return self._lock is not None
+
+    def release(self):
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+    def is_active(self):
+        """Whether some process (this one included) is currently scraping this run."""
+        if self._lock is not None:
+            return True
+        if fcntl is None:
+            return False
+        handle = _try_lock(self.run_dir)
+        if handle is None:
+            return True
+        handle.close()
+        return False
+
+    @property
+    def sources(self):
+        return self.manifest["sources"]
+
+    def _records(self):
+        """Parsed journal lines, skipping a torn final line."""
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def _repair_tail(self):
+        """Terminate a line torn by a crash so the next record starts cleanly."""
+        with open(self.journal_path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _done_records(self):
+        return [r for r in self._records() if r.get("type") == "site_done"]
+
+    def completed_sites(self):
+        return {r["site"] for r in self._done_records()}
+
+    def append_site(self, site, jobs):
+        """Durably record all jobs for ``site`` and mark it complete."""
+        batch = time.time_ns()
+        self._repair_tail()
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            for job in jobs:
+                record = {"type": "job", "batch": batch, "job": job}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.write(json.dumps({"type": "site_done", "batch": batch, "site": site, "jobs": len(jobs)}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.manifest["sites_done"] += 1
+        self.manifest["jobs_written"] += len(jobs)
+        _write_json_atomic(self.manifest_path, self.manifest)
+
+    def finish(self):
+        self.manifest["status"] = "finished"
+        self.manifest["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        _write_json_atomic(self.manifest_path, self.manifest)
+
+    def iter_jobs(self):
+        """Jobs from completed sites, streamed from disk."""
+        done = {r["batch"] for r in self._done_records()}
+        for record in self._records():
+            if record.get("type") == "job" and record["batch"] in done:
+                yield record["job"]
+
+    def build_dataset(self):
+        """Final de-duplicated DataFrame assembled from the journal."""
+        seen = set()
+        jobs = []
+        for job in self.iter_jobs():
+            key = (job.get("title"), job.get("company"))
+            if key not in seen:
+                seen.add(key)
+                jobs.append(job)
+        return pd.DataFrame(jobs)
+
+
+def prune_runs(runs_dir=RUNS_DIR, keep=KEEP_RUNS):
+    """Delete all but the ``keep`` newest runs once their jobs are published.
+    
+    Journals hold every scraped job and description, so old ones only cost
+    disk. The newest run is always kept, finished or not.
+    """
+    if not os.path.isdir(runs_dir):
+        return
+    runs = sorted(
+        (name for name in os.listdir(runs_dir) if os.path.isdir(os.path.join(runs_dir, name))),
+        reverse=True,
+    )
+    for name in runs[max(keep, 1):]:
+        shutil.rmtree(os.path.join(runs_dir, name), ignore_errors=True)
+        print(f"[GC] Removed scrape run {name}")
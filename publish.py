@@ -0,0 +1,159 @@
+"""Versioned, atomically switched job datasets.
+
+Each publish writes a complete dataset into its own directory,
+``datasets/<version>/``, and then points ``datasets/CURRENT`` at it with a
+single ``os.replace``. Readers resolve CURRENT and only ever open finished
+version directories, so they never see a half-written file. Old versions
+are garbage-collected, keeping the most recent few for readers that are
+still rendering them.
+"""
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime
+
+from facets import compute_facets, read_facets, write_facets
+from storage import load_descriptions, load_jobs_cache, save_jobs_cache
+
+DATASETS_DIR = "datasets"
+POINTER_FILE = "CURRENT"
+JOBS_FILE = "jobs.csv"
+KEEP_VERSIONS = 3
+
+# (pointer inode, mtime_ns, size) -> manifest, so unchanged pointers cost one stat call
+_pointer_cache = {}
+
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def dataset_file(version, datasets_dir=DATASETS_DIR):
+    """Path of the jobs CSV for a published version."""
+    return os.path.join(datasets_dir, version, JOBS_FILE)
+
+
+def current_manifest(datasets_dir=DATASETS_DIR):
+    """Manifest of the current version ({"version", "published_at", "jobs"}), or None."""
+    pointer = os.path.join(datasets_dir, POINTER_FILE)
+    try:
+        stat = os.stat(pointer)
+    except OSError:
+        return None
+
+    # Every publish os.replace()s the pointer, so its inode changes even when
+    # mtime (coarse on some filesystems) and size do not
+    key = (pointer, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    # Looked up once: another thread may clear the cache between a check and a read
+    manifest = _pointer_cache.get(key)
+    if manifest is None:
+        try:
+            with open(pointer, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        _pointer_cache.clear()
+        _pointer_cache[key] = manifest
+    return manifest
+
+
+def current_version(datasets_dir=DATASETS_DIR):
+    manifest = current_manifest(datasets_dir)
+    return manifest["version"] if manifest else None
+
+
+def load_version(version, datasets_dir=DATASETS_DIR):
+    """Jobs frame and description store for a published version."""
+    filename = dataset_file(version, datasets_dir)
+    return load_jobs_cache(filename), load_descriptions(filename)
+
+
+def load_facets(version, datasets_dir=DATASETS_DIR):
+    """Facet counts stored with a version, or None for versions published without them."""
+    return read_facets(os.path.join(datasets_dir, version))
+
+
+def publish_dataset(df, datasets_dir=DATASETS_DIR, keep=KEEP_VERSIONS):
+    """Write ``df`` as a new version and switch CURRENT to it atomically.
+
+    Returns the new version id, or None if writing failed (CURRENT is then
+    left pointing at the previous version).
+    """
+    # Microseconds keep lexical order equal to publish order for GC
+    version = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{uuid.uuid4().hex[:4]}"
+    staging = os.path.join(datasets_dir, f".{version}.tmp")
+
+    # Any failure before the rename leaves CURRENT untouched; the staging
+    # directory is removed here because collect_garbage skips dot-directories
+    try:
+        os.makedirs(staging, exist_ok=True)
+        if not save_jobs_cache(df, os.path.join(staging, JOBS_FILE)):
+            raise OSError("saving the jobs file failed")
+
+        manifest = {
+            "version": version,
+            "published_at": datetime.now().isoformat(timespec="seconds"),
+            "jobs": len(df),
+        }
+        with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        write_facets(compute_facets(df), staging)
+        for name in os.listdir(staging):
+            with open(os.path.join(staging, name), "rb") as f:
+                os.fsync(f.fileno())
+
+        os.replace(staging, os.path.join(datasets_dir, version))
+    except Exception as e:
+        print(f"[ERROR] Publishing dataset version {version}: {e}")
+        shutil.rmtree(staging, ignore_errors=True)
+        return None
+
+    pointer = os.path.join(datasets_dir, POINTER_FILE)
+    with open(f"{pointer}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f"{pointer}.tmp", pointer)
+    _fsync_dir(datasets_dir)
+
+    print(f"[PUBLISHED] Dataset version {version} ({len(df)} jobs)")
+    collect_garbage(datasets_dir, keep)
+    return version
+
+
+def collect_garbage(datasets_dir=DATASETS_DIR, keep=KEEP_VERSIONS):
+    """Delete all but the ``keep`` newest versions (never the current one)."""
+    current = current_version(datasets_dir)
+    versions = sorted(
+        (name for name in os.listdir(datasets_dir)
+         if not name.startswith(".") and os.path.isdir(os.path.join(datasets_dir, name))),
+        reverse=True,
+    )
+    for name in versions[keep:]:
+        if name != current:
+            shutil.rmtree(os.path.join(datasets_dir, name), ignore_errors=True)
+            print(f"[GC] Removed dataset version {name}")
+
+
+def migrate_legacy_cache(filename="jobs_cache.csv", datasets_dir=DATASETS_DIR):
+    """Publish an old single-file cache once, if nothing is published yet."""
+    if current_version(datasets_dir) is not None or not os.path.exists(filename):
+        return None
+    df = load_jobs_cache(filename, lazy=False)
+    if df.empty:
+        return None
+    if "description" not in df.columns:
+        descriptions = load_descriptions(filename)
+        if descriptions is not None:
+            df["description"] = descriptions.get(range(len(df)))
+    return publish_dataset(df, datasets_dir)
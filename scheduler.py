@@ -1,8 +1,12 @@
 
 import schedule
+import sys
 import time
 from datetime import datetime
-from scraper import scrape_all_sources, save_jobs_cache
+from scraper import scrape_all_sources
+from publish import publish_dataset
+from journal import prune_runs
+from alerts import run_saved_searches
 import logging
 
 # Setup logging
@@ -17,25 +21,35 @@ logging.basicConfig(
 
 GITHUB_RAW_URL = "https://raw.githubusercontent.com/ZainMushtaq9/Kashif-Birthday-wishes/main/job_links.txt"
 
-def daily_scrape_job():
+def daily_scrape_job(resume=False):
     """Function to run daily scraping."""
     logging.info("="*50)
-    logging.info("Starting daily job scraping...")
+    logging.info("Resuming interrupted job scraping..." if resume else "Starting daily job scraping...")
     
     try:
         # Scrape all sources
-        df = scrape_all_sources(GITHUB_RAW_URL)
+        df = scrape_all_sources(GITHUB_RAW_URL, resume=resume)
         
         if df.empty:
             logging.warning("No jobs found during scraping!")
             return
         
-        # Save to cache
-        save_jobs_cache(df, "jobs_cache.csv")
+        # Publish as a new dataset version; running apps pick it up on their next rerun
+        version = publish_dataset(df)
+        if version is None:
+            logging.error("Publishing the new dataset failed; keeping the previous version")
+            return
+        
+        # The run's jobs are now in the published dataset
+        prune_runs()
+        
+        # Notify saved searches about jobs that are new since the last run
+        matches = run_saved_searches(df)
+        logging.info(f"Saved-search alerts sent for {len(matches)} searches")
         
         logging.info(f"Successfully scraped {len(df)} jobs")
         logging.info(f"Unique companies: {df['company'].nunique()}")
-        logging.info(f"Unique locations: {df['location'].nunique()}")
+        logging.info(f"Unique locations: {df['city'].nunique()}")
         
         # Optional: Save backup with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -46,14 +60,18 @@ def daily_scrape_job():
     except Exception as e:
         logging.error(f"Error during scraping: {e}", exc_info=True)
 
-def run_scheduler():
-    """Run the scheduler continuously."""
+def run_scheduler(resume=False):
+    """Run the scheduler continuously.
+    
+    With ``resume`` set, the initial scrape continues the last interrupted
+    run instead of starting from the first site.
+    """
     # Schedule daily at 12:00 AM
     schedule.every().day.at("00:00").do(daily_scrape_job)
     
     # Also run immediately on start
     logging.info("Running initial scrape...")
-    daily_scrape_job()
+    daily_scrape_job(resume=resume)
     
     logging.info("Scheduler started. Jobs will run daily at 12:00 AM")
     
@@ -63,7 +81,7 @@ def run_scheduler():
 
 if __name__ == "__main__":
     try:
-        run_scheduler()
+        run_scheduler(resume="--resume" in sys.argv[1:])
     except KeyboardInterrupt:
         logging.info("Scheduler stopped by user")
     except Exception as e:
@@ -0,0 +1,189 @@
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from gazetteer import CITY_DTYPE, UNSPECIFIED_CITY
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    STRING_DTYPE = pd.StringDtype()
+
+# Low-cardinality text stored once per distinct value
+CATEGORY_COLUMNS = ["source", "company", "location", "category", "salary_period"]
+# Free text, kept in contiguous Arrow buffers instead of one Python object per cell
+STRING_COLUMNS = ["title", "salary", "link"]
+DATETIME_COLUMNS = ["posted_date", "scrape_time"]
+FLOAT_COLUMNS = ["salary_min", "salary_max"]
+
+# Descriptions are the largest column and only needed for the page on screen
+LAZY_COLUMNS = ["description"]
+
+# Keyword masks remembered per store, so reruns that only change the page or
+# sort order do not rescan the sidecar
+SEARCH_CACHE_SIZE = 32
+
+
+def column_dtypes(columns):
+    """read_csv dtype mapping for the given cache columns."""
+    dtypes = {}
+    for column in columns:
+        if column in CATEGORY_COLUMNS:
+            dtypes[column] = "category"
+        elif column in STRING_COLUMNS:
+            dtypes[column] = STRING_DTYPE
+        elif column in FLOAT_COLUMNS:
+            dtypes[column] = "float32"
+        elif column == "city":
+            dtypes[column] = CITY_DTYPE
+    return dtypes
+
+
+def apply_schema(df):
+    """Convert a jobs DataFrame to the compact in-memory dtypes."""
+    if df.empty:
+        return df
+
+    df = df.copy()
+    for column, dtype in column_dtypes(df.columns).items():
+        df[column] = df[column].astype(dtype)
+    for column in DATETIME_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    if "city" in df.columns:
+        df["city"] = df["city"].fillna(UNSPECIFIED_CITY)
+    return df
+
+
+def read_jobs_csv(filename, lazy=True):
+    """Read a jobs cache straight into the compact dtypes.
+
+    With ``lazy`` set, columns in ``LAZY_COLUMNS`` are skipped; use
+    ``DescriptionStore`` to read them for the rows being rendered.
+    """
+    columns = pd.read_csv(filename, nrows=0).columns
+    if lazy:
+        columns = [c for c in columns if c not in LAZY_COLUMNS]
+
+    df = pd.read_csv(
+        filename,
+        usecols=columns,
+        dtype=column_dtypes(columns),
+        parse_dates=[c for c in DATETIME_COLUMNS if c in columns],
+    )
+    if "city" in df.columns:
+        df["city"] = df["city"].fillna(UNSPECIFIED_CITY)
+    return df
+
+
+def descriptions_path(filename):
+    """Sidecar file holding the descriptions for a jobs cache CSV."""
+    return os.path.splitext(filename)[0] + ".descriptions.jsonl"
+
+
+def write_descriptions(descriptions, path):
+    """Write one JSON string per row, in DataFrame row order."""
+    with open(path, "w", encoding="utf-8") as f:
+        for text in descriptions:
+            f.write(json.dumps("" if pd.isna(text) else str(text), ensure_ascii=False))
+            f.write("\n")
+
+
+class DescriptionStore:
+    """Job descriptions kept on disk and read by row number.
+
+    Only an array of line offsets is held in memory (8 bytes per job).
+    Row numbers are positions in the cache file, which is also the index
+    ``read_jobs_csv`` gives the DataFrame.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        offsets = [0]
+        with open(path, "rb") as f:
+            for line in f:
+                offsets.append(offsets[-1] + len(line))
+        self.offsets = np.array(offsets[:-1], dtype=np.int64)
+        self._searches = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def get(self, rows):
+        """Descriptions for the given row numbers, in the same order."""
+        texts = []
+        with open(self.path, "rb") as f:
+            for row in rows:
+                f.seek(self.offsets[row])
+                texts.append(json.loads(f.readline()))
+        return texts
+
+    def search(self, query):
+        """Boolean mask of rows whose description contains ``query`` (case-insensitive).
+
+        A store belongs to one published version, so results are cached by
+        query; the returned mask is read-only.
+        """
+        key = query.lower()
+        with self._lock:
+            if key in self._searches:
+                self._searches.move_to_end(key)
+                return self._searches[key]
+
+        pattern = re.compile(re.escape(query), re.I)
+        mask = np.zeros(len(self), dtype=bool)
+        with open(self.path, encoding="utf-8") as f:
+            for row, line in enumerate(f):
+                if pattern.search(json.loads(line)):
+                    mask[row] = True
+        mask.flags.writeable = False
+
+        with self._lock:
+            self._searches[key] = mask
+            if len(self._searches) > SEARCH_CACHE_SIZE:
+                self._searches.popitem(last=False)
+        return mask
+
+
+def memory_report(df):
+    """Deep memory use per column, in total and per row."""
+    usage = df.memory_usage(deep=True, index=False)
+    rows = max(len(df), 1)
+    report = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": usage,
+        "bytes_per_row": (usage / rows).round(1),
+    })
+    report.loc["TOTAL"] = ["", usage.sum(), round(usage.sum() / rows, 1)]
+    return report
+
+
+if __name__ == "__main__":
+    # Usage: python schema.py [jobs_cache.csv]
+    filename = sys.argv[1] if len(sys.argv) > 1 else "jobs_cache.csv"
+
+    raw = pd.read_csv(filename, dtype=object)
+    if os.path.exists(descriptions_path(filename)):
+        texts = DescriptionStore(descriptions_path(filename)).get(range(len(raw)))
+        raw["description"] = pd.Series(texts, dtype=object)
+    compact = read_jobs_csv(filename)
+
+    print(f"[REPORT] {len(raw)} jobs in {filename}\n")
+    print("All-object columns:")
+    print(memory_report(raw).to_string())
+    print("\nCompact schema (descriptions on disk):")
+    print(memory_report(compact).to_string())
+
+    before = raw.memory_usage(deep=True, index=False).sum()
+    after = compact.memory_usage(deep=True, index=False).sum()
+    rows = max(len(raw), 1)
+    print(f"\n[REPORT] {before / rows:.0f} -> {after / rows:.0f} bytes/row "
+          f"({before / max(after, 1):.1f}x smaller)")
@@ -1,4 +1,6 @@
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import requests
 from datetime import datetime
@@ -9,9 +11,43 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
+from feeds import scrape_structured
+from frontier import CrawlFrontier, MAX_DEPTH, MAX_PAGES, MAX_PER_HOST, absolute_links, fetch_slot
+from utils import SALARY_HINT, normalize_salary
+from gazetteer import match_city, normalize_city
+from journal import RUNS_DIR, ScrapeJournal
+# Cache I/O lives in the lightweight storage module; re-exported for existing callers
+from storage import save_jobs_cache, load_jobs_cache, load_descriptions
 
-def init_driver():
-    """Initialize headless Chromium for Streamlit Cloud."""
+# Per-page extraction limits; coverage beyond one page comes from the crawl frontier
+MAX_ELEMENTS_PER_SELECTOR = 50
+MAX_JOBS_PER_PAGE = 50
+
+# Lean browser profile: job text only needs the DOM, not rendering assets
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.css",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*facebook.net*",
+    "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*", "*taboola.com*",
+    "*outbrain.com*", "*scorecardresearch.com*", "*quantserve.com*",
+]
+
+# Seconds to let scripts render listings after navigation
+FULL_SETTLE_SECONDS = 4
+LEAN_SETTLE_SECONDS = 1.5
+
+# Restart Chrome after this many pages or once its process tree exceeds this RSS
+DRIVER_MAX_PAGES = 40
+DRIVER_MAX_RSS_MB = 1024
+
+def init_driver(lean=True):
+    """Initialize headless Chromium for Streamlit Cloud.
+    
+    The lean profile blocks images, fonts, stylesheets, media and common
+    ad/analytics hosts and returns from ``get`` at DOMContentLoaded.
+    """
     chrome_options = Options()
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
@@ -20,11 +56,107 @@ def init_driver():
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
     
+    if lean:
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.media_stream": 2,
+        })
+    
     try:
         service = Service("/usr/bin/chromedriver")
-        return webdriver.Chrome(service=service, options=chrome_options)
+        driver = webdriver.Chrome(service=service, options=chrome_options)
     except:
-        return webdriver.Chrome(options=chrome_options)
+        driver = webdriver.Chrome(options=chrome_options)
+    
+    if lean:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"[WARNING] Could not enable request blocking: {e}")
+    
+    return driver
+
+def _child_pids(pid):
+    """All descendant process ids of ``pid`` (Linux /proc only)."""
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(c) for c in f.read().split())
+    except OSError:
+        return []
+    return children + [gc for child in children for gc in _child_pids(child)]
+
+def driver_rss_mb(driver):
+    """Resident memory of chromedriver and all Chrome processes, in MB.
+    
+    Returns 0 where /proc is unavailable, which disables the memory check.
+    """
+    try:
+        root = driver.service.process.pid
+    except AttributeError:
+        return 0
+    total_kb = 0
+    for pid in [root] + _child_pids(root):
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+class ManagedDriver:
+    """Chrome driver that is started on first use and recycled periodically.
+    
+    Long runs leak memory inside one Chrome instance, so the driver is
+    replaced after ``max_pages`` pages or when its process tree grows past
+    ``max_rss_mb``.
+    """
+    
+    def __init__(self, lean=True, max_pages=DRIVER_MAX_PAGES, max_rss_mb=DRIVER_MAX_RSS_MB):
+        self.lean = lean
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.settle = LEAN_SETTLE_SECONDS if lean else FULL_SETTLE_SECONDS
+        self.driver = None
+        self.pages = 0
+        self.restarts = 0
+    
+    def get(self):
+        """Return a live driver, recycling the current one if it is due."""
+        if self.driver is not None and self._due():
+            print(f"[DRIVER] Recycling Chrome after {self.pages} pages")
+            self.quit()
+            self.restarts += 1
+        if self.driver is None:
+            self.driver = init_driver(lean=self.lean)
+            self.pages = 0
+        return self.driver
+    
+    def page_done(self):
+        self.pages += 1
+    
+    def _due(self):
+        if self.pages >= self.max_pages:
+            return True
+        return self.max_rss_mb and driver_rss_mb(self.driver) > self.max_rss_mb
+    
+    def quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
 
 def get_job_links_from_github(raw_url: str):
     """Fetch list of job site URLs from a raw GitHub txt file."""
@@ -63,9 +195,7 @@ def extract_job_details(element, url):
         # Extract location
         location = "Pakistan"
         for line in lines:
-            if any(city in line.lower() for city in ['karachi', 'lahore', 'islamabad', 'rawalpindi', 
-                                                       'faisalabad', 'multan', 'peshawar', 'quetta', 
-                                                       'pakistan', 'remote']):
+            if match_city(line) or 'pakistan' in line.lower():
                 location = line[:100]
                 break
         
@@ -84,7 +214,7 @@ def extract_job_details(element, url):
         # Extract salary if mentioned
         salary = "Not specified"
         for line in text.split('\n'):
-            if any(word in line.lower() for word in ['rs', 'pkr', 'salary', 'lakh', 'thousand', 'k per']):
+            if SALARY_HINT.search(line):
                 salary = line.strip()[:100]
                 break
         
@@ -102,12 +232,12 @@ def extract_job_details(element, url):
     except Exception as e:
         return None
 
-def scrape_with_selenium(driver, url):
+def scrape_with_selenium(driver, url, settle=FULL_SETTLE_SECONDS):
     """Scrape jobs using Selenium with multiple selectors."""
     jobs = []
     try:
         driver.get(url)
-        time.sleep(4)
+        time.sleep(settle)
         
         # Wait for page to load
         WebDriverWait(driver, 10).until(
@@ -125,12 +255,12 @@ def scrape_with_selenium(driver, url):
         for selector in selectors:
             try:
                 elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                for elem in elements[:20]:  # Limit to 20 per selector
+                for elem in elements[:MAX_ELEMENTS_PER_SELECTOR]:
                     job_data = extract_job_details(elem, url)
                     if job_data and job_data not in jobs:
                         jobs.append(job_data)
                 
-                if len(jobs) >= 15:
+                if len(jobs) >= MAX_JOBS_PER_PAGE:
                     break
             except:
                 continue
@@ -140,113 +270,159 @@ def scrape_with_selenium(driver, url):
     
     return jobs
 
-def scrape_with_beautifulsoup(url):
-    """Fallback scraper using BeautifulSoup."""
+def parse_listing_html(html, url):
+    """Extract job cards and outgoing links from a listing page's HTML."""
     jobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Find job containers
+    job_containers = []
+    for tag in ['article', 'div', 'li', 'tr']:
+        for class_name in ['job', 'vacancy', 'listing', 'card', 'item']:
+            job_containers.extend(soup.find_all(tag, class_=lambda x: x and class_name in x.lower()))
+    
+    for container in job_containers[:MAX_JOBS_PER_PAGE]:
+        text = container.get_text(strip=True)
+        if len(text) > 30:
+            title = text[:150].split('\n')[0]
+            link_tag = container.find('a')
+            job_link = link_tag.get('href') if link_tag else url
+            
+            if job_link and not job_link.startswith('http'):
+                job_link = requests.compat.urljoin(url, job_link)
+            
+            jobs.append({
+                "title": title,
+                "company": url.split("//")[-1].split("/")[0].replace("www.", "").split('.')[0].title(),
+                "location": "Pakistan",
+                "description": text[:300],
+                "salary": "Not specified",
+                "link": job_link,
+                "source": url.split("//")[-1].split("/")[0],
+                "posted_date": datetime.now().strftime("%Y-%m-%d"),
+                "scrape_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            })
+    
+    anchors = [(a.get('href'), a.get_text(strip=True)) for a in soup.find_all('a')]
+    return jobs, absolute_links(url, anchors)
+
+def fetch_listing_page(url):
+    """Fetch one listing page over HTTP, respecting the per-host and global fetch limits."""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        with fetch_slot(url):
+            response = requests.get(url, headers=headers, timeout=10)
         response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find job containers
-        job_containers = []
-        for tag in ['article', 'div', 'li', 'tr']:
-            for class_name in ['job', 'vacancy', 'listing', 'card', 'item']:
-                job_containers.extend(soup.find_all(tag, class_=lambda x: x and class_name in x.lower()))
-        
-        for container in job_containers[:15]:
-            text = container.get_text(strip=True)
-            if len(text) > 30:
-                title = text[:150].split('\n')[0]
-                link_tag = container.find('a')
-                job_link = link_tag.get('href') if link_tag else url
-                
-                if job_link and not job_link.startswith('http'):
-                    job_link = requests.compat.urljoin(url, job_link)
-                
-                jobs.append({
-                    "title": title,
-                    "company": url.split("//")[-1].split("/")[0].replace("www.", "").split('.')[0].title(),
-                    "location": "Pakistan",
-                    "description": text[:300],
-                    "salary": "Not specified",
-                    "link": job_link,
-                    "source": url.split("//")[-1].split("/")[0],
-                    "posted_date": datetime.now().strftime("%Y-%m-%d"),
-                    "scrape_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                })
-                
+        return parse_listing_html(response.content, url)
     except Exception as e:
         print(f"[ERROR] BeautifulSoup scraping {url}: {e}")
+        return [], []
+
+def scrape_with_beautifulsoup(url):
+    """Fallback scraper using BeautifulSoup."""
+    jobs, _ = fetch_listing_page(url)
+    return jobs
+
+def crawl_source(url, landing_html=None, max_depth=MAX_DEPTH, max_pages=MAX_PAGES):
+    """Follow pagination and listing links from a source's landing page.
+    
+    If ``landing_html`` is given (e.g. from Selenium) the landing page is not
+    fetched again and only its links are used to seed the frontier. Pages are
+    fetched at most ``MAX_PER_HOST`` at a time, spaced by the host delay, and
+    within the ``MAX_CONCURRENCY`` limit across all sources.
+    """
+    frontier = CrawlFrontier(url, max_depth=max_depth, max_pages=max_pages)
+    jobs = []
+    
+    if landing_html is not None:
+        frontier.pop_batch(1)
+        _, links = parse_listing_html(landing_html, url)
+        frontier.add_links(links, 0)
+    
+    with ThreadPoolExecutor(max_workers=MAX_PER_HOST) as pool:
+        while frontier:
+            batch = frontier.pop_batch(MAX_PER_HOST)
+            results = pool.map(lambda item: fetch_listing_page(item[0]), batch)
+            for (page_url, depth), (page_jobs, links) in zip(batch, results):
+                jobs.extend(page_jobs)
+                frontier.add_links(links, depth)
     
     return jobs
 
-def scrape_all_sources(raw_txt_url):
-    """Main scraping function that processes all job sources."""
-    links = get_job_links_from_github(raw_txt_url)
+def scrape_all_sources(raw_txt_url, resume=False, runs_dir=RUNS_DIR):
+    """Main scraping function that processes all job sources.
     
-    if not links:
-        print("[ERROR] No links loaded from GitHub")
+    Each site's jobs are appended to a run journal as soon as they are
+    scraped. With ``resume`` set, the latest unfinished run is continued,
+    skipping sites it already completed.
+    """
+    journal = ScrapeJournal.latest_incomplete(runs_dir) if resume else None
+    
+    # Another process may have claimed the run since it was looked up
+    if journal is not None and not journal.acquire():
+        print(f"[RESUME] Run {journal.manifest['run_id']} is being scraped by another process")
         return pd.DataFrame()
     
-    driver = None
-    all_jobs = []
+    if journal is not None:
+        links = journal.sources
+        done = journal.completed_sites()
+        print(f"[RESUME] Run {journal.manifest['run_id']}: {len(done)}/{len(links)} sites already done")
+    else:
+        links = get_job_links_from_github(raw_txt_url)
+        if not links:
+            print("[ERROR] No links loaded from GitHub")
+            return pd.DataFrame()
+        journal = ScrapeJournal.create(links, runs_dir)
+        done = set()
+    
+    browser = ManagedDriver()
     
     try:
-        driver = init_driver()
-        
         for i, site in enumerate(links, 1):
+            if site in done:
+                continue
             print(f"[SCRAPE {i}/{len(links)}] Processing: {site}")
             
-            # Try Selenium first
-            site_jobs = scrape_with_selenium(driver, site)
+            # Structured data (JSON-LD, RSS/Atom, sitemaps) needs no browser
+            site_jobs = scrape_structured(site)
+            if site_jobs:
+                print(f"[FEED] Using structured data for {site}")
+            
+            # Fall back to DOM heuristics with Selenium, then crawl deeper pages
+            if not site_jobs:
+                driver = browser.get()
+                site_jobs = scrape_with_selenium(driver, site, settle=browser.settle)
+                browser.page_done()
+                if site_jobs:
+                    site_jobs.extend(crawl_source(site, landing_html=driver.page_source))
             
             # Fallback to BeautifulSoup if Selenium fails
             if not site_jobs:
                 print(f"[FALLBACK] Trying BeautifulSoup for {site}")
-                site_jobs = scrape_with_beautifulsoup(site)
+                site_jobs = crawl_source(site)
             
-            all_jobs.extend(site_jobs)
+            journal.append_site(site, site_jobs)
             print(f"[INFO] Found {len(site_jobs)} jobs from {site}")
             
             time.sleep(2)  # Rate limiting
-            
+        
+        journal.finish()
     except Exception as e:
         print(f"[ERROR] Main scraping error: {e}")
+        print(f"[INFO] Completed sites are kept in {journal.run_dir}; rerun with resume=True")
     finally:
-        if driver:
-            driver.quit()
+        browser.quit()
+        journal.release()
     
-    # Create DataFrame and remove duplicates
-    df = pd.DataFrame(all_jobs)
+    # Build the DataFrame from the journal (already de-duplicated)
+    df = journal.build_dataset()
     if not df.empty:
-        df = df.drop_duplicates(subset=['title', 'company'], keep='first')
+        df = normalize_salary(df)
+        df["city"] = normalize_city(df["location"], df["title"])
         print(f"[SUCCESS] Total unique jobs scraped: {len(df)}")
     else:
         print("[WARNING] No jobs found")
     
     return df
-
-def save_jobs_cache(df, filename="jobs_cache.csv"):
-    """Save scraped jobs to cache file."""
-    try:
-        df.to_csv(filename, index=False)
-        print(f"[SAVED] Jobs cached to {filename}")
-        return True
-    except Exception as e:
-        print(f"[ERROR] Could not save cache: {e}")
-        return False
-
-def load_jobs_cache(filename="jobs_cache.csv"):
-    """Load jobs from cache file."""
-    try:
-        df = pd.read_csv(filename)
-        print(f"[LOADED] {len(df)} jobs from cache")
-        return df
-    except Exception as e:
-        print(f"[INFO] No cache file found: {e}")
-        return pd.DataFrame()
@@ -0,0 +1,67 @@
+"""Reading and writing job caches.
+
+Part of the lightweight read path: importing this module (or publish, utils,
+api) must not pull in selenium, BeautifulSoup or requests, which only the
+scraping path in scraper.py needs.
+"""
+import os
+
+import pandas as pd
+
+from gazetteer import normalize_city
+from schema import (DescriptionStore, apply_schema, descriptions_path,
+                    read_jobs_csv, write_descriptions)
+from utils import normalize_salary
+
+
+def save_jobs_cache(df, filename="jobs_cache.csv"):
+    """Save scraped jobs to cache file.
+    
+    Descriptions go to a JSON-lines sidecar so readers can leave them on disk.
+    """
+    try:
+        # Write to temporary files and rename, so readers never see partial files
+        if "description" in df.columns:
+            sidecar = descriptions_path(filename)
+            write_descriptions(df["description"], f"{sidecar}.tmp")
+            os.replace(f"{sidecar}.tmp", sidecar)
+            df = df.drop(columns=["description"])
+        df.to_csv(f"{filename}.tmp", index=False)
+        os.replace(f"{filename}.tmp", filename)
+        print(f"[SAVED] Jobs cached to {filename}")
+        return True
+    except Exception as e:
+        print(f"[ERROR] Could not save cache: {e}")
+        return False
+
+
+def load_jobs_cache(filename="jobs_cache.csv", lazy=True):
+    """Load jobs from cache file into the compact schema.
+    
+    With ``lazy`` set (and a descriptions sidecar present) the description
+    column is not loaded; see ``load_descriptions``.
+    """
+    try:
+        lazy = lazy and os.path.exists(descriptions_path(filename))
+        df = read_jobs_csv(filename, lazy=lazy)
+        
+        # Caches written before ingest-time normalization
+        if "salary_min" not in df.columns:
+            df = normalize_salary(df)
+        if "city" not in df.columns and not df.empty:
+            df["city"] = normalize_city(df["location"], df["title"])
+        df = apply_schema(df)
+        
+        print(f"[LOADED] {len(df)} jobs from cache")
+        return df
+    except Exception as e:
+        print(f"[INFO] No cache file found: {e}")
+        return pd.DataFrame()
+
+
+def load_descriptions(filename="jobs_cache.csv"):
+    """Open the on-disk descriptions for a cache file, or None if there are none."""
+    path = descriptions_path(filename)
+    if not os.path.exists(path):
+        return None
+    return DescriptionStore(path)
@@ -0,0 +1,45 @@
+"""Browsing the published dataset must never import the scraping stack.
+
+Each check runs in a fresh interpreter so modules imported by pytest or
+by other tests do not leak into ``sys.modules``.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+BROWSE_MODULES = ["storage", "publish", "facets", "utils", "gazetteer", "schema", "journal", "alerts", "api"]
+SCRAPE_ONLY_MODULES = ["selenium", "bs4", "requests", "fpdf"]
+
+
+def loaded_after(code, cwd):
+    probe = code + (
+        "\nimport json, sys"
+        "\nprint(json.dumps(sorted({m.split('.')[0] for m in sys.modules})))"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], cwd=cwd, capture_output=True,
+                            text=True, check=True, env=dict(os.environ, PYTHONPATH=ROOT))
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+def test_browse_modules_do_not_import_scraper_dependencies(tmp_path):
+    loaded = loaded_after(f"for name in {BROWSE_MODULES!r}:\n    __import__(name)", tmp_path)
+    assert "selenium" not in loaded
+    assert not loaded & set(SCRAPE_ONLY_MODULES)
+
+
+def test_app_run_does_not_import_scraper_dependencies(tmp_path):
+    pytest.importorskip("streamlit")
+    app = os.path.join(ROOT, "app.py")
+    loaded = loaded_after(
+        "from streamlit.testing.v1 import AppTest\n"
+        f"at = AppTest.from_file({app!r}, default_timeout=120).run()\n"
+        "assert not at.exception, [e.value for e in at.exception]",
+        tmp_path,
+    )
+    assert "selenium" not in loaded
+    assert not loaded & set(SCRAPE_ONLY_MODULES)
@@ -0,0 +1,34 @@
+"""Salary strings as they appear on job boards, parsed to monthly PKR."""
+import math
+
+import pandas as pd
+import pytest
+
+from utils import parse_salaries
+
+CASES = [
+    ("Rs. 50,000 - 80,000 per month", 50_000, 80_000),
+    ("50-80k", 50_000, 80_000),
+    ("50k - 80000", 50_000, 80_000),
+    ("1.2 to 1.5 lakh", 120_000, 150_000),
+    ("80,000 PKR", 80_000, 80_000),
+    ("2 years experience, salary 60k", 60_000, 60_000),
+    ("Hours 9 to 5, salary 50,000", 50_000, 50_000),
+    ("Working hours: 9-6, Rs 70000", 70_000, 70_000),
+    ("60,000/- per month", 60_000, 60_000),
+    ("Rs 80,000 - 1.2 lakh", 80_000, 120_000),
+    ("PKR 1.2 million per annum", 100_000, 100_000),
+]
+
+
+@pytest.mark.parametrize("text, low, high", CASES)
+def test_parses_monthly_range(text, low, high):
+    parsed = parse_salaries(pd.Series([text])).iloc[0]
+    assert parsed["salary_min"] == pytest.approx(low)
+    assert parsed["salary_max"] == pytest.approx(high)
+
+
+@pytest.mark.parametrize("text", ["Not specified", "", "$5,000 per month", "3 years experience"])
+def test_unparseable_salaries_are_missing(text):
+    parsed = parse_salaries(pd.Series([text])).iloc[0]
+    assert math.isnan(parsed["salary_min"]) and math.isnan(parsed["salary_max"])
@@ -1,6 +1,48 @@
+import re
+import numpy as np
 import pandas as pd
-from fpdf import FPDF
 from datetime import datetime
+from gazetteer import canonical_city, city_code, city_counts
+
+# A line mentions pay if it has a currency, a pay keyword, an amount in k/lakh
+# or the "/-" that closes rupee amounts ("60,000/-")
+SALARY_HINT = re.compile(r"\b(?:rs\.?|pkr|salary|lakh|lac|thousand)\b|\d\s*k\b|\bk\s*per\b|\d\s*/-", re.I)
+
+_AMOUNT = r"(\d+(?:\.\d+)?)\s*(lakhs?|lacs?|lac|k|thousand|million|m)?\b"
+SALARY_RANGE = rf"{_AMOUNT}(?:\s*(?:-|–|to)\s*(?:rs\.?|pkr)?\s*{_AMOUNT})?"
+
+# Tried in order; the first that matches a row wins. Amounts right after a
+# currency or pay keyword, then amounts right before a currency, and only then
+# the first number in the text ("2 years experience, salary 60k" is 60k).
+SALARY_PATTERNS = [
+    rf"\b(?:rs\.?|pkr|salary|pay)\b[^\d]{{0,25}}{SALARY_RANGE}",
+    rf"{SALARY_RANGE}\s*(?:rs\b|pkr|/-)",
+    SALARY_RANGE,
+]
+
+SALARY_UNITS = {
+    "lakh": 100_000, "lakhs": 100_000, "lac": 100_000, "lacs": 100_000,
+    "k": 1_000, "thousand": 1_000, "million": 1_000_000, "m": 1_000_000,
+}
+
+# Multipliers that convert a stated pay period to a monthly amount
+SALARY_PERIODS = {
+    "hourly": 8 * 22,
+    "daily": 22,
+    "weekly": 52 / 12,
+    "monthly": 1,
+    "annual": 1 / 12,
+}
+_PERIOD_PATTERNS = [
+    ("hourly", r"per hour|/\s*hr\b|hourly"),
+    ("daily", r"per day|/\s*day\b|daily"),
+    ("weekly", r"per week|/\s*week\b|weekly"),
+    ("annual", r"per year|per annum|/\s*yr\b|/\s*year\b|yearly|annual|\bp\.?a\.?\b"),
+    ("monthly", r"per month|/\s*mo|\bp\.?m\.?\b|monthly|month"),
+]
+
+# Plausible monthly PKR range; anything outside is treated as a parsing miss
+SALARY_BOUNDS = (5_000, 10_000_000)
 
 def save_to_csv(df, filename="jobs.csv"):
     """Save DataFrame to CSV file."""
@@ -14,6 +56,9 @@ def save_to_csv(df, filename="jobs.csv"):
 def save_to_pdf(df, filename="jobs.pdf"):
     """Save jobs to PDF file."""
     try:
+        # Imported here so browsing and search never load the PDF library
+        from fpdf import FPDF
+        
         pdf = FPDF()
         pdf.add_page()
         pdf.set_font("Arial", 'B', 16)
@@ -46,17 +91,30 @@ def save_to_pdf(df, filename="jobs.pdf"):
         print(f"Error saving PDF: {e}")
         return None
 
-def search_jobs(df, query):
-    """Search jobs by query string."""
+def search_jobs(df, query, descriptions=None):
+    """Search jobs by query string.
+    
+    ``descriptions`` is an optional on-disk DescriptionStore for frames
+    loaded without their description column.
+    """
     if df.empty or not query:
         return df
     
     query = query.lower()
+    if "description" in df.columns:
+        description_match = df["description"].str.lower().str.contains(query, na=False, regex=False)
+    elif descriptions is not None:
+        # Store rows are positions in the unfiltered cache, which is also its
+        # index, so this holds for already-filtered views too
+        description_match = df.index.isin(np.flatnonzero(descriptions.search(query)))
+    else:
+        description_match = False
+    
     mask = (
-        df["title"].str.lower().str.contains(query, na=False) |
-        df["company"].str.lower().str.contains(query, na=False) |
-        df["description"].str.lower().str.contains(query, na=False) |
-        df["location"].str.lower().str.contains(query, na=False)
+        df["title"].str.lower().str.contains(query, na=False, regex=False) |
+        df["company"].str.lower().str.contains(query, na=False, regex=False) |
+        description_match |
+        df["location"].str.lower().str.contains(query, na=False, regex=False)
     )
     return df[mask]
 
@@ -65,8 +123,26 @@ def filter_by_location(df, location):
     if df.empty or location == "All Locations":
         return df
     
+    if "city" in df.columns:
+        city = canonical_city(location) or location
+        return df[df["city"].cat.codes.to_numpy() == city_code(city)]
+    
     return df[df["location"].str.contains(location, case=False, na=False)]
 
+def filter_by_category(df, category):
+    """Filter jobs by category."""
+    if df.empty or not category or category == "All Categories":
+        return df
+    
+    return df[df["category"] == category]
+
+def filter_by_source(df, source):
+    """Filter jobs by source website."""
+    if df.empty or not source or source == "All Sources":
+        return df
+    
+    return df[df["source"] == source]
+
 def filter_by_company(df, company):
     """Filter jobs by company name."""
     if df.empty or not company:
@@ -74,19 +150,134 @@ def filter_by_company(df, company):
     
     return df[df["company"].str.contains(company, case=False, na=False)]
 
-def filter_by_salary(df, min_salary=None, max_salary=None):
-    """Filter jobs by salary range (if available)."""
-    if df.empty:
+def parse_salaries(salaries):
+    """Parse raw salary strings into monthly PKR amounts.
+    
+    Handles ranges ("50k - 80k", "1.2 to 1.5 lakh"), units (k, thousand,
+    lakh, million) and pay periods. Returns a DataFrame aligned with
+    ``salaries`` holding ``salary_min``/``salary_max`` per month and the
+    ``salary_period`` the posting was stated in (NaN where unparseable).
+    """
+    text = salaries.fillna("").astype(str).str.lower().str.replace(",", "", regex=False)
+    parts = text.str.extract(SALARY_PATTERNS[0])
+    for pattern in SALARY_PATTERNS[1:]:
+        missing = parts[0].isna()
+        if not missing.any():
+            break
+        parts[missing] = text[missing].str.extract(pattern)
+    
+    low = pd.to_numeric(parts[0], errors="coerce")
+    high = pd.to_numeric(parts[2], errors="coerce")
+    low_unit = parts[1].map(SALARY_UNITS)
+    high_unit = parts[3].map(SALARY_UNITS)
+    
+    # "50-80k": a trailing unit applies to both ends of the range when the low
+    # number is the smaller one ("80,000 - 1.2 lakh" is already in full), but a
+    # leading one never does ("50k - 80000" is already in full on the high end)
+    low_unit = low_unit.fillna(high_unit.where(low <= high)).fillna(1)
+    high_unit = high_unit.fillna(1)
+    low = low * low_unit
+    high = (high * high_unit).fillna(low)
+    
+    period = pd.Series(np.nan, index=salaries.index, dtype=object)
+    for name, pattern in reversed(_PERIOD_PATTERNS):
+        period = period.mask(text.str.contains(pattern, regex=True), name)
+    period = period.where(low.notna())
+    period = period.fillna("monthly").where(low.notna())
+    
+    factor = period.map(SALARY_PERIODS).astype(float)
+    salary_min = np.minimum(low, high) * factor
+    salary_max = np.maximum(low, high) * factor
+    
+    valid = (
+        text.str.contains(SALARY_HINT) &
+        ~text.str.contains(r"\$|usd|dollar", regex=True) &
+        salary_min.between(*SALARY_BOUNDS) &
+        salary_max.between(*SALARY_BOUNDS)
+    )
+    
+    return pd.DataFrame({
+        "salary_min": salary_min.where(valid),
+        "salary_max": salary_max.where(valid),
+        "salary_period": period.where(valid),
+    }, index=salaries.index)
+
+def normalize_salary(df):
+    """Add numeric ``salary_min``, ``salary_max`` and ``salary_period`` columns."""
+    if df.empty or "salary" not in df.columns:
         return df
     
-    # This is a basic implementation - you may need to parse salary strings
-    filtered_df = df.copy()
+    df = df.copy()
+    parsed = parse_salaries(df["salary"])
+    for column in parsed.columns:
+        df[column] = parsed[column]
+    return df
+
+class SalaryIndex:
+    """Sorted views of salary_min/salary_max for range filters and sorting.
     
-    if min_salary or max_salary:
-        # Add your salary parsing logic here
-        pass
+    Built once per dataset. Range lookups are two binary searches plus an
+    intersection of the matching row positions, instead of a full scan.
+    """
+    
+    def __init__(self, df):
+        if "salary_min" not in df.columns:
+            df = normalize_salary(df)
+        mins = df["salary_min"].to_numpy(dtype=float, na_value=np.nan) if len(df) else np.array([])
+        maxs = df["salary_max"].to_numpy(dtype=float, na_value=np.nan) if len(df) else np.array([])
+        rows = np.flatnonzero(~np.isnan(mins))
+        
+        order = np.argsort(mins[rows], kind="stable")
+        self.rows_by_min = rows[order]
+        self.sorted_min = mins[rows][order]
+        
+        order = np.argsort(maxs[rows], kind="stable")
+        self.rows_by_max = rows[order]
+        self.sorted_max = maxs[rows][order]
     
-    return filtered_df
+    def range(self, min_salary=None, max_salary=None):
+        """Row positions whose salary range overlaps [min_salary, max_salary]."""
+        rows = self.rows_by_min
+        if max_salary:
+            end = np.searchsorted(self.sorted_min, max_salary, side="right")
+            rows = self.rows_by_min[:end]
+        if min_salary:
+            start = np.searchsorted(self.sorted_max, min_salary, side="left")
+            above = self.rows_by_max[start:]
+            rows = np.intersect1d(rows, above, assume_unique=True) if max_salary else above
+        return np.sort(rows)
+    
+    def sorted_rows(self, descending=False):
+        """Row positions with a salary, ordered by salary (max for descending)."""
+        if descending:
+            return self.rows_by_max[::-1]
+        return self.rows_by_min
+
+def filter_by_salary(df, min_salary=None, max_salary=None, index=None):
+    """Filter jobs by salary range (monthly PKR, if available)."""
+    if df.empty or not (min_salary or max_salary):
+        return df
+    
+    if index is None:
+        if "salary_min" not in df.columns:
+            df = normalize_salary(df)
+        index = SalaryIndex(df)
+    
+    return df.iloc[index.range(min_salary, max_salary)]
+
+def sort_by_salary(df, descending=True, index=None):
+    """Order jobs by salary using the sorted index; jobs without salary go last."""
+    if df.empty:
+        return df
+    
+    if index is None:
+        if "salary_min" not in df.columns:
+            df = normalize_salary(df)
+        index = SalaryIndex(df)
+    
+    ranked = index.sorted_rows(descending)
+    rest = np.setdiff1d(np.arange(len(df)), ranked, assume_unique=True)
+    return df.iloc[np.concatenate([ranked, rest])]
 
 def get_job_statistics(df):
     """Get statistics about jobs."""
@@ -99,12 +290,18 @@ def get_job_statistics(df):
             "top_locations": []
         }
     
+    if "city" in df.columns:
+        locations = city_counts(df["city"])
+        locations = locations[locations > 0].sort_values(ascending=False, kind="stable")
+    else:
+        locations = df["location"].value_counts()
+    
     stats = {
         "total_jobs": len(df),
         "total_companies": df["company"].nunique(),
-        "total_locations": df["location"].nunique(),
+        "total_locations": len(locations),
         "top_companies": df["company"].value_counts().head(10).to_dict(),
-        "top_locations": df["location"].value_counts().head(10).to_dict(),
+        "top_locations": locations.head(10).to_dict(),
         "jobs_by_source": df["source"].value_counts().to_dict()
     }
     
@@ -143,6 +340,33 @@ def deduplicate_jobs(df):
     
     return df.drop_duplicates(subset=["title", "company"], keep="first")
 
+CATEGORY_KEYWORDS = [
+    ("IT & Software", ["engineer", "developer", "programmer", "software", "it"]),
+    ("Management", ["manager", "executive", "director", "head", "ceo"]),
+    ("Sales & Marketing", ["marketing", "sales", "business"]),
+    ("Finance & Accounting", ["accountant", "finance", "audit", "banking"]),
+    ("Education", ["teacher", "professor", "education", "lecturer"]),
+    ("Healthcare", ["doctor", "nurse", "medical", "health"]),
+    ("Engineering", ["civil", "mechanical", "electrical"]),
+]
+
+def categorize_job(title):
+    """Job category from title keywords."""
+    title = str(title).lower()
+    for category, words in CATEGORY_KEYWORDS:
+        if any(word in title for word in words):
+            return category
+    return "Other"
+
+def add_categories(df):
+    """Add a categorical ``category`` column if the data has none."""
+    if df.empty or "category" in df.columns:
+        return df
+    
+    df = df.copy()
+    df["category"] = df["title"].map(categorize_job).astype("category")
+    return df
+
 def enrich_job_data(df):
     """Add additional computed fields to job data."""
     if df.empty:
@@ -157,24 +381,7 @@ def enrich_job_data(df):
     except:
         df["days_old"] = 0
     
-    # Add job category based on title keywords
-    def categorize_job(title):
-        title = title.lower()
-        if any(word in title for word in ["engineer", "developer", "programmer"]):
-            return "IT & Software"
-        elif any(word in title for word in ["manager", "executive", "director"]):
-            return "Management"
-        elif any(word in title for word in ["marketing", "sales"]):
-            return "Sales & Marketing"
-        elif any(word in title for word in ["accountant", "finance"]):
-            return "Finance & Accounting"
-        elif any(word in title for word in ["teacher", "professor", "education"]):
-            return "Education"
-        elif any(word in title for word in ["doctor", "nurse", "medical"]):
-            return "Healthcare"
-        else:
-            return "Other"
-    
-    df["category"] = df["title"].apply(categorize_job)
+    # Add job category based on title keywords (same table as add_categories)
+    df["category"] = df["title"].map(categorize_job).astype("category")
     
     return df